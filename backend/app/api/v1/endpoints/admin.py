@@ -0,0 +1,36 @@
+import os
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.config import PROFILING_DIR
+from app.core.profiling import PROFILE_ID_PATTERN, list_profiles, profile_path
+from app.core.security import require_admin
+
+PROFILES_PAGE_MAX = 500
+
+router = APIRouter(
+    prefix="/api/v1/admin",
+    dependencies=[Depends(require_admin)],
+)
+
+
+@router.get("/profiles")
+def profiles(limit: int = 50, offset: int = 0):
+    # Newest first, one page at a time
+    if limit < 1 or limit > PROFILES_PAGE_MAX or offset < 0:
+        raise HTTPException(
+            status_code=400, detail=f"limit must be 1-{PROFILES_PAGE_MAX} and offset not negative"
+        )
+    total, page = list_profiles(PROFILING_DIR, limit, offset)
+    return {"total": total, "limit": limit, "offset": offset, "profiles": page}
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def profile(profile_id: str):
+    # Collapsed stacks, ready for flamegraph.pl or speedscope
+    path = profile_path(PROFILING_DIR, profile_id)
+    if not PROFILE_ID_PATTERN.match(profile_id) or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="No such profile")
+    with open(path, encoding="utf-8") as f:
+        return f.read()
@@ -1,20 +1,128 @@
+from typing import Union
+
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+from app.config import BATCH_MAX_SENTENCES, COMPLETION_TOP_K
+from app.core.profiling import run_in_threadpool
+from app.core.security import authorize_user
 from app.services.spell_checker import check_sentence
-from app.utils.utils import load_dictionary
+from app.dependencies import (
+    get_completion_trie,
+    get_grammar_checker,
+    get_grammar_flight,
+    get_language_model,
+    get_sinhala_dictionary,
+    get_spelling_flight,
+    get_user_dictionaries,
+)
+from app.models.schemas import (
+    BatchSpellCheckResponse,
+    CompactBatchSpellCheckResponse,
+    CompactSpellCheckResponse,
+    CompletionResponse,
+    GrammarCheckResponse,
+    SpellCheckResponse,
+    to_compact,
+)
+from app.services.grammar_checker import GrammarModelUnavailable
 
 router = APIRouter(
     prefix="/api/v1"
 )
 
 
+def get_overlay(request, user_id):
+    # Words the user added are searched together with the shared dictionary,
+    # with the same X-User-Token check as the /users endpoints
+    if not user_id:
+        return None
+    store = get_user_dictionaries()
+    authorize_user(store, user_id, request.headers.get("x-user-token"), request.headers.get("x-admin-token"))
+    return store.get(user_id).data
+
+
 @router.get("/home")
 def read_root():
     return {"message": "Hello World"}
 
-@router.post("/check_spelling")
-async def check_spelling(request: Request):
-    # Load the Sinhala dictionary CSV
-    sinhala_dictionary = load_dictionary("app/utils/sinhala_dict_with_ipa.csv")
+@router.post(
+    "/check_spelling",
+    response_model=Union[SpellCheckResponse, CompactSpellCheckResponse],
+)
+async def check_spelling(request: Request, format: str = "full"):
+    # format=compact sends corrections as offsets and suggestion indices
+    # Sinhala dictionary CSV, loaded once per process
+    sinhala_dictionary = get_sinhala_dictionary()
     body = await request.json()
-    print(body)
-    return check_sentence(body["sentence"], sinhala_dictionary)
\ No newline at end of file
+
+    overlay = get_overlay(request, body.get("user_id"))
+
+    # Offsets refer to the exact input, so only identical sentences are merged;
+    # the response format is applied afterwards and is not part of the key
+    key = (body["sentence"], body.get("user_id") or None)
+    result = await get_spelling_flight().do(
+        key, check_sentence, body["sentence"], sinhala_dictionary, get_language_model(), overlay
+    )
+    # The response model documents the schema; returning the response directly
+    # skips validating and re-serializing results that are built here anyway
+    return ORJSONResponse(to_compact(result) if format == "compact" else result)
+
+@router.post(
+    "/check_spelling/batch",
+    response_model=Union[BatchSpellCheckResponse, CompactBatchSpellCheckResponse],
+)
+async def check_spelling_batch(request: Request, format: str = "full"):
+    body = await request.json()
+    sentences = body.get("sentences")
+    if not isinstance(sentences, list) or not all(isinstance(s, str) for s in sentences):
+        raise HTTPException(status_code=400, detail="Provide a list of 'sentences'")
+    if len(sentences) > BATCH_MAX_SENTENCES:
+        raise HTTPException(
+            status_code=413, detail=f"A batch is limited to {BATCH_MAX_SENTENCES} sentences"
+        )
+    overlay = get_overlay(request, body.get("user_id"))
+    sinhala_dictionary = get_sinhala_dictionary()
+    language_model = get_language_model()
+
+    def check_all():
+        return [
+            check_sentence(sentence, sinhala_dictionary, language_model, overlay)
+            for sentence in sentences
+        ]
+
+    # One worker thread for the whole batch keeps the event loop free
+    results = await run_in_threadpool(check_all)
+    if format == "compact":
+        results = [to_compact(result) for result in results]
+    return ORJSONResponse({"results": results})
+
+@router.post("/check_grammar", response_model=GrammarCheckResponse)
+async def check_grammar(request: Request):
+    body = await request.json()
+    checker = await run_in_threadpool(get_grammar_checker)
+    try:
+        # The checker strips the sentence, so that is the key
+        sentence = body["sentence"].strip()
+        return await get_grammar_flight().do(sentence, checker.check, sentence)
+    except GrammarModelUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/stats/coalescing")
+def coalescing_stats():
+    # Per worker process: how many requests shared a computation
+    return {
+        "check_spelling": get_spelling_flight().stats,
+        "check_grammar": get_grammar_flight().stats,
+    }
+
+
+@router.get("/complete", response_model=CompletionResponse)
+def complete(prefix: str, limit: int = COMPLETION_TOP_K):
+    prefix = prefix.strip()
+    if not prefix:
+        raise HTTPException(status_code=400, detail="prefix must not be empty")
+    # Only the top COMPLETION_TOP_K completions are precomputed per prefix
+    if limit < 1 or limit > COMPLETION_TOP_K:
+        raise HTTPException(status_code=400, detail=f"limit must be 1-{COMPLETION_TOP_K}")
+    return {"prefix": prefix, "completions": get_completion_trie().complete(prefix, limit)}
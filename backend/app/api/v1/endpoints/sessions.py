@@ -0,0 +1,84 @@
+import asyncio
+import json
+from functools import lru_cache
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import (
+    SESSION_EXPIRE_INTERVAL,
+    SESSION_IDLE_TIMEOUT,
+    SESSION_MAX_DOCUMENT_CHARS,
+    SESSION_MAX_SESSIONS,
+    SESSION_WORD_CACHE_SIZE,
+)
+from app.dependencies import get_sinhala_dictionary
+from app.services.document_session import SessionError, SessionStore
+
+router = APIRouter(
+    prefix="/api/v1"
+)
+
+
+@lru_cache(maxsize=None)
+def get_session_store():
+    return SessionStore(
+        get_sinhala_dictionary(),
+        max_sessions=SESSION_MAX_SESSIONS,
+        idle_timeout=SESSION_IDLE_TIMEOUT,
+        max_document_chars=SESSION_MAX_DOCUMENT_CHARS,
+        word_cache_size=SESSION_WORD_CACHE_SIZE,
+    )
+
+
+async def expire_sessions_periodically():
+    # Idle sessions are dropped even when no new client connects
+    while True:
+        await asyncio.sleep(SESSION_EXPIRE_INTERVAL)
+        if get_session_store.cache_info().currsize:
+            get_session_store().expire()
+
+
+@router.websocket("/sessions")
+async def check_session(websocket: WebSocket, session_id: str = None):
+    # Reconnecting with a known session_id resumes its document state. When
+    # the id is unknown (expired, or held by another worker) the reply says
+    # resumed: false with a new id, and the client must send "set" again
+    await websocket.accept()
+    store = await run_in_threadpool(get_session_store)
+    session, resumed = store.get_or_create(session_id)
+    version, corrections = session.snapshot()
+    await websocket.send_json({
+        "type": "session",
+        "session_id": session.session_id,
+        "resumed": resumed,
+        "version": version,
+        "corrections": corrections,
+    })
+
+    try:
+        while True:
+            try:
+                text = await asyncio.wait_for(websocket.receive_text(), SESSION_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                store.discard(session.session_id)
+                await websocket.close(code=1000, reason="Session idle timeout")
+                return
+
+            store.touch(session)
+            try:
+                # A malformed message is answered like any other bad edit
+                # instead of closing the socket
+                message = json.loads(text)
+            except ValueError:
+                await websocket.send_json({"type": "error", "message": "Messages must be valid JSON"})
+                continue
+            try:
+                # Only the sentences touched by the edit are re-checked
+                diff = await run_in_threadpool(session.apply, message)
+            except SessionError as e:
+                await websocket.send_json({"type": "error", "message": str(e)})
+                continue
+            await websocket.send_json(diff)
+    except WebSocketDisconnect:
+        pass
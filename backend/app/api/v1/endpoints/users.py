@@ -0,0 +1,54 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+
+from app.core.security import authorize_user
+from app.dependencies import get_user_dictionaries
+from app.services.user_dictionary import UserDictionaryError
+
+router = APIRouter(
+    prefix="/api/v1/users"
+)
+
+
+def get_user_dictionary(
+    user_id: str,
+    x_user_token: Optional[str] = Header(default=None),
+    x_admin_token: Optional[str] = Header(default=None),
+):
+    store = get_user_dictionaries()
+    authorize_user(store, user_id, x_user_token, x_admin_token)
+    return store.get(user_id)
+
+
+@router.post("")
+def create_user():
+    # The token is only shown here; send it as X-User-Token from now on
+    user_id, token = get_user_dictionaries().create()
+    return {"user_id": user_id, "token": token}
+
+
+@router.get("/{user_id}/words")
+def list_words(user_id: str, dictionary=Depends(get_user_dictionary)):
+    return {"user_id": user_id, "words": list(dictionary.data["words"])}
+
+
+@router.post("/{user_id}/words")
+async def add_words(user_id: str, request: Request, dictionary=Depends(get_user_dictionary)):
+    body = await request.json()
+    words = body.get("words") or ([body["word"]] if body.get("word") else [])
+    if not words or not all(isinstance(w, str) for w in words):
+        raise HTTPException(status_code=400, detail="Provide 'word' or a list of 'words'")
+
+    try:
+        added = dictionary.add(words)
+    except UserDictionaryError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return {"user_id": user_id, "added": added, "total": len(dictionary)}
+
+
+@router.delete("/{user_id}/words/{word}")
+def remove_word(user_id: str, word: str, dictionary=Depends(get_user_dictionary)):
+    if not dictionary.remove(word):
+        raise HTTPException(status_code=404, detail=f"'{word}' is not in the user dictionary")
+    return {"user_id": user_id, "removed": word, "total": len(dictionary)}
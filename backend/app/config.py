@@ -0,0 +1,48 @@
+import os
+
+# Sinhala dictionary with IPA transcriptions, relative to the backend directory
+DICTIONARY_PATH = os.getenv("DICTIONARY_PATH", "app/utils/sinhala_dict_with_ipa.csv")
+
+# Incremental checking sessions
+SESSION_IDLE_TIMEOUT = float(os.getenv("SESSION_IDLE_TIMEOUT", "300"))  # seconds
+SESSION_EXPIRE_INTERVAL = float(os.getenv("SESSION_EXPIRE_INTERVAL", "60"))  # seconds
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+SESSION_MAX_DOCUMENT_CHARS = int(os.getenv("SESSION_MAX_DOCUMENT_CHARS", "200000"))
+SESSION_WORD_CACHE_SIZE = int(os.getenv("SESSION_WORD_CACHE_SIZE", "5000"))
+
+# Optional n-gram language model used to rerank spelling candidates by context
+LANGUAGE_MODEL_PATH = os.getenv("LANGUAGE_MODEL_PATH", "app/utils/ngram_model")
+LANGUAGE_MODEL_CANDIDATES = int(os.getenv("LANGUAGE_MODEL_CANDIDATES", "8"))
+LANGUAGE_MODEL_WEIGHT = float(os.getenv("LANGUAGE_MODEL_WEIGHT", "0.5"))
+# Only candidates this much further than the closest one are reranked; 0 lets
+# the model break distance ties and nothing more
+LANGUAGE_MODEL_MAX_EXTRA_DISTANCE = int(os.getenv("LANGUAGE_MODEL_MAX_EXTRA_DISTANCE", "0"))
+
+# Prefix completion
+COMPLETION_TOP_K = int(os.getenv("COMPLETION_TOP_K", "10"))
+
+# Sentences accepted by one /check_spelling/batch request
+BATCH_MAX_SENTENCES = int(os.getenv("BATCH_MAX_SENTENCES", "100"))
+
+# Per-user dictionaries layered over the shared one
+USER_DICTIONARY_DIR = os.getenv("USER_DICTIONARY_DIR", "data/user_dictionaries")
+USER_DICTIONARY_MAX_WORDS = int(os.getenv("USER_DICTIONARY_MAX_WORDS", "10000"))
+USER_DICTIONARY_MAX_LOADED = int(os.getenv("USER_DICTIONARY_MAX_LOADED", "1000"))
+
+# Grammar checking cascade: known sentences, heuristics, then the transformer
+GRAMMAR_MODEL_PATH = os.getenv("GRAMMAR_MODEL_PATH", "../legacy/models/model2")
+GRAMMAR_SENTENCES_PATH = os.getenv("GRAMMAR_SENTENCES_PATH", "../legacy/data/merged_sentences.csv")
+GRAMMAR_HEURISTICS_PATH = os.getenv("GRAMMAR_HEURISTICS_PATH", "../legacy/data/grammar_heuristics.json")
+GRAMMAR_MODEL_RETRY_INTERVAL = float(os.getenv("GRAMMAR_MODEL_RETRY_INTERVAL", "300"))  # seconds after a failed load
+
+# Admin-only features such as request profiling are disabled unless a token is set
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Request profiling: admins enable it per request with the X-Profile header or
+# ?profile=1, and PROFILING_SAMPLE_RATE profiles that fraction of all requests
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_INTERVAL = float(os.getenv("PROFILING_INTERVAL", "0.001"))  # seconds between stack samples
+PROFILING_DIR = os.getenv("PROFILING_DIR", "data/profiles")
+# Retention: the newest PROFILING_MAX_PROFILES are kept, none older than PROFILING_MAX_AGE seconds
+PROFILING_MAX_PROFILES = int(os.getenv("PROFILING_MAX_PROFILES", "1000"))
+PROFILING_MAX_AGE = float(os.getenv("PROFILING_MAX_AGE", str(7 * 24 * 3600)))
@@ -0,0 +1,42 @@
+import asyncio
+
+from app.core.profiling import run_in_threadpool
+
+
+class SingleFlight:
+    # Concurrent calls with the same key share one computation: the first
+    # caller runs func in the thread pool, later callers await the same task.
+    # Nothing is kept once the computation finishes, so this only merges
+    # requests that overlap in time. Used from the event loop thread only.
+    def __init__(self):
+        self._inflight = {}
+        self.calls = 0
+        self.computations = 0
+
+    async def do(self, key, func, *args):
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.computations += 1
+            task = asyncio.ensure_future(run_in_threadpool(func, *args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        # A caller that disconnects must not cancel the work others are waiting on
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved here in case every waiter has gone
+
+    @property
+    def stats(self):
+        coalesced = self.calls - self.computations
+        return {
+            "calls": self.calls,
+            "computations": self.computations,
+            "coalesced": coalesced,
+            "coalesced_rate": coalesced / self.calls if self.calls else 0.0,
+            "in_flight": len(self._inflight),
+        }
@@ -0,0 +1,203 @@
+import contextlib
+import json
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from urllib.parse import parse_qs
+
+from fastapi.concurrency import run_in_threadpool as starlette_run_in_threadpool
+
+from app.core.security import is_admin_token
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9TZ]{16}-[0-9a-f]{8}$")
+
+# The sampler of the request being handled, if it is being profiled
+current_sampler = ContextVar("current_sampler", default=None)
+
+
+class StackSampler:
+    # Statistical profiler: a background thread records the stacks of the
+    # threads working on one request every interval seconds. Output is in the
+    # collapsed format read by flamegraph.pl and speedscope.
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.threads = {}  # thread id -> role shown at the root of its stacks
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id, role in list(self.threads.items()):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.stacks[collapse_stack(role, frame)] += 1
+            self.samples += 1
+
+    def run_registered(self, func, *args):
+        # Runs func with the calling thread's stacks included in the profile
+        thread_id = threading.get_ident()
+        self.threads[thread_id] = "worker"
+        try:
+            return func(*args)
+        finally:
+            del self.threads[thread_id]
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def collapse_stack(role, frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.append(role)
+    return ";".join(reversed(names))
+
+
+async def run_in_threadpool(func, *args):
+    # Starlette's run_in_threadpool, with the worker thread sampled when the
+    # current request is being profiled
+    sampler = current_sampler.get()
+    if sampler is None:
+        return await starlette_run_in_threadpool(func, *args)
+    return await starlette_run_in_threadpool(sampler.run_registered, func, *args)
+
+
+def profile_path(directory, profile_id):
+    return os.path.join(directory, f"{profile_id}.folded")
+
+
+def profile_ids(directory):
+    # Newest first: ids start with their UTC timestamp
+    if not os.path.isdir(directory):
+        return []
+    names = [name for name in os.listdir(directory) if name.endswith(".json")]
+    return sorted((name[:-len(".json")] for name in names), reverse=True)
+
+
+def list_profiles(directory, limit=50, offset=0):
+    # Returns (total, summaries); only the requested page is read from disk
+    ids = profile_ids(directory)
+    profiles = []
+    for profile_id in ids[offset:offset + limit]:
+        # Retention may delete a profile while it is being listed
+        with contextlib.suppress(FileNotFoundError):
+            with open(os.path.join(directory, f"{profile_id}.json")) as f:
+                profiles.append(json.load(f))
+    return len(ids), profiles
+
+
+def prune_profiles(directory, max_profiles=None, max_age=None):
+    # Deletes the oldest profiles beyond max_profiles and any older than
+    # max_age seconds; None disables either limit
+    ids = profile_ids(directory)
+    expired = ids[max_profiles:] if max_profiles is not None else []
+    if max_age is not None:
+        cutoff = time.time() - max_age
+        for profile_id in ids[:len(ids) - len(expired)]:
+            with contextlib.suppress(FileNotFoundError):
+                if os.path.getmtime(os.path.join(directory, f"{profile_id}.json")) < cutoff:
+                    expired.append(profile_id)
+    for profile_id in expired:
+        for path in (profile_path(directory, profile_id), os.path.join(directory, f"{profile_id}.json")):
+            # Another worker may be pruning the same files
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+    return len(expired)
+
+
+class ProfilingMiddleware:
+    # Profiles a request when an admin asks for it with the X-Profile header
+    # or ?profile=1 (plus X-Admin-Token), or when it falls in the sampled
+    # fraction. Collapsed stacks and a JSON summary are written to directory
+    # and the response carries X-Profile-Id. Only installed when enabled, so
+    # requests pay nothing otherwise. Each save prunes the directory down to
+    # max_profiles and max_age seconds.
+
+    def __init__(self, app, directory, sample_rate=0.0, interval=0.001, max_profiles=None, max_age=None):
+        self.app = app
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.max_profiles = max_profiles
+        self.max_age = max_age
+
+    def trigger(self, scope):
+        headers = dict(scope["headers"])
+        requested = b"x-profile" in headers or parse_qs(
+            scope["query_string"].decode("latin-1")
+        ).get("profile", ["0"])[0] in ("1", "true")
+        if requested and is_admin_token(headers.get(b"x-admin-token", b"").decode("latin-1")):
+            return "admin"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trigger = self.trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{secrets.token_hex(4)}"
+        sampler = StackSampler(self.interval)
+        sampler.threads[threading.get_ident()] = "event-loop"
+        token = current_sampler.set(sampler)
+        status = None
+
+        async def send_with_profile_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message["headers"]) + [(b"x-profile-id", profile_id.encode("latin-1"))]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            current_sampler.reset(token)
+            summary = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "trigger": trigger,
+                "duration_ms": round((time.perf_counter() - start) * 1e3, 3),
+                "interval_ms": self.interval * 1e3,
+                "samples": sampler.samples,
+            }
+            await starlette_run_in_threadpool(self.save, profile_id, sampler.collapsed(), summary)
+
+    def save(self, profile_id, collapsed, summary):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(profile_path(self.directory, profile_id), "w", encoding="utf-8") as f:
+            f.write(collapsed)
+        with open(os.path.join(self.directory, f"{profile_id}.json"), "w") as f:
+            json.dump(summary, f)
+        prune_profiles(self.directory, self.max_profiles, self.max_age)
@@ -0,0 +1,30 @@
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from app.config import ADMIN_TOKEN
+from app.services.user_dictionary import UserDictionaryError, validate_user_id
+
+
+def is_admin_token(token):
+    # Always false while no admin token is configured
+    if not ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+
+def authorize_user(store, user_id, user_token, admin_token):
+    # The same rule wherever a user's dictionary is used: the user's own
+    # X-User-Token, or the admin token
+    try:
+        validate_user_id(user_id)
+    except UserDictionaryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not (is_admin_token(admin_token) or store.authenticate(user_id, user_token)):
+        raise HTTPException(status_code=403, detail="A valid X-User-Token header is required")
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="A valid X-Admin-Token header is required")
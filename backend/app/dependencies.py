@@ -0,0 +1,79 @@
+import logging
+import os
+from functools import lru_cache
+
+from app.config import (
+    COMPLETION_TOP_K,
+    DICTIONARY_PATH,
+    GRAMMAR_HEURISTICS_PATH,
+    GRAMMAR_MODEL_PATH,
+    GRAMMAR_MODEL_RETRY_INTERVAL,
+    GRAMMAR_SENTENCES_PATH,
+    LANGUAGE_MODEL_PATH,
+    USER_DICTIONARY_DIR,
+    USER_DICTIONARY_MAX_LOADED,
+    USER_DICTIONARY_MAX_WORDS,
+)
+from app.core.cache import SingleFlight
+from app.services.completion import CompletionTrie
+from app.services.grammar_checker import GrammarChecker, load_heuristics, load_sentence_index
+from app.services.user_dictionary import UserDictionaryStore
+from app.utils.utils import load_dictionary
+
+
+@lru_cache(maxsize=None)
+def get_sinhala_dictionary():
+    # Loaded once per process and shared by every request
+    return load_dictionary(DICTIONARY_PATH)
+
+
+@lru_cache(maxsize=None)
+def get_language_model():
+    # Reranking is skipped when no model has been built
+    if not os.path.exists(os.path.join(LANGUAGE_MODEL_PATH, "meta.json")):
+        return None
+    # numpy comes with the model, so a server without one never imports it
+    from app.services.language_model import NgramLanguageModel
+
+    try:
+        return NgramLanguageModel(LANGUAGE_MODEL_PATH)
+    except ValueError as e:
+        # A stale artifact must not take the spelling endpoints down with it
+        logging.getLogger(__name__).warning("Language model disabled: %s", e)
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_completion_trie():
+    return CompletionTrie(get_sinhala_dictionary()["words"], top_k=COMPLETION_TOP_K)
+
+
+@lru_cache(maxsize=None)
+def get_user_dictionaries():
+    return UserDictionaryStore(
+        USER_DICTIONARY_DIR,
+        max_words=USER_DICTIONARY_MAX_WORDS,
+        max_loaded=USER_DICTIONARY_MAX_LOADED,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_grammar_checker():
+    # The transformer itself is loaded on the first sentence that needs it
+    return GrammarChecker(
+        GRAMMAR_MODEL_PATH,
+        load_sentence_index(GRAMMAR_SENTENCES_PATH),
+        load_heuristics(GRAMMAR_HEURISTICS_PATH),
+        retry_interval=GRAMMAR_MODEL_RETRY_INTERVAL,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_spelling_flight():
+    # Identical spelling requests in flight at the same time share one check
+    return SingleFlight()
+
+
+@lru_cache(maxsize=None)
+def get_grammar_flight():
+    return SingleFlight()
@@ -1,9 +1,55 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from app.api.v1.endpoints.admin import router as admin_router
 from app.api.v1.endpoints.ai_inference import router as api_router
+from app.api.v1.endpoints.sessions import expire_sessions_periodically, router as sessions_router
+from app.api.v1.endpoints.users import router as users_router
+from app.config import (
+    ADMIN_TOKEN,
+    PROFILING_DIR,
+    PROFILING_INTERVAL,
+    PROFILING_MAX_AGE,
+    PROFILING_MAX_PROFILES,
+    PROFILING_SAMPLE_RATE,
+)
+from app.core.compression import CompressionMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.dependencies import get_grammar_checker, get_language_model, get_sinhala_dictionary
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Built once before the first request: lru_cache does not stop a burst of
+    # cold requests from each building them, and the dictionary would
+    # otherwise load on the event loop
+    for build in (get_sinhala_dictionary, get_language_model, get_grammar_checker):
+        await run_in_threadpool(build)
+    expiry = asyncio.create_task(expire_sessions_periodically())
+    yield
+    expiry.cancel()
+
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+if ADMIN_TOKEN or PROFILING_SAMPLE_RATE:
+    # Not installed at all unless profiling can be requested
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=PROFILING_DIR,
+        sample_rate=PROFILING_SAMPLE_RATE,
+        interval=PROFILING_INTERVAL,
+        max_profiles=PROFILING_MAX_PROFILES,
+        max_age=PROFILING_MAX_AGE,
+    )
 
 app.include_router(api_router)
+app.include_router(admin_router)
+app.include_router(sessions_router)
+app.include_router(users_router)
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,70 @@
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+class Correction(BaseModel):
+    word: str
+    correction: str
+    distance: Optional[int] = None
+    start: int
+    end: int
+
+
+class SpellCheckResponse(BaseModel):
+    original_sentence: str
+    corrected_sentence: str
+    corrections: List[Correction]
+
+
+class CompactSpellCheckResponse(BaseModel):
+    # Corrections as [start, end, suggestion index, distance]; the misspelled
+    # word is original_sentence[start:end] and each distinct suggestion is
+    # sent once in suggestions
+    original_sentence: str
+    corrected_sentence: str
+    suggestions: List[str]
+    corrections: List[Tuple[int, int, int, Optional[int]]]
+
+
+class BatchSpellCheckResponse(BaseModel):
+    results: List[SpellCheckResponse]
+
+
+class CompactBatchSpellCheckResponse(BaseModel):
+    results: List[CompactSpellCheckResponse]
+
+
+class ProblematicWord(BaseModel):
+    word: str
+    position: int
+    correction: str
+
+
+class GrammarCheckResponse(BaseModel):
+    text: str
+    has_error: bool
+    confidence: float
+    correction: Optional[str] = None
+    problematic_words: List[ProblematicWord]
+    stage: str
+    model_calls_avoided: int
+
+
+class CompletionResponse(BaseModel):
+    prefix: str
+    completions: List[str]
+
+
+def to_compact(result):
+    suggestions = {}
+    corrections = []
+    for c in result["corrections"]:
+        index = suggestions.setdefault(c["correction"], len(suggestions))
+        corrections.append((c["start"], c["end"], index, c["distance"]))
+    return {
+        "original_sentence": result["original_sentence"],
+        "corrected_sentence": result["corrected_sentence"],
+        "suggestions": list(suggestions),
+        "corrections": corrections,
+    }
@@ -0,0 +1,134 @@
+import heapq
+import unicodedata
+from array import array
+
+
+class CompletionTrie:
+    # Radix tree over the sorted word list, flattened into typed arrays.
+    #
+    # Nodes are numbered breadth first, so the children of node i are the
+    # contiguous ids first_child[i] .. first_child[i + 1]. Every node covers the
+    # words sharing its prefix, which form the range lo[i] .. hi[i] of the sorted
+    # list; its prefix is the first depth[i] characters of any of those words,
+    # so edge labels need no storage of their own. Nodes covering more than
+    # top_k words keep a precomputed list of their best top_k completions.
+
+    def __init__(self, words, top_k=10, key=None):
+        words = sorted(set(unicodedata.normalize("NFC", w) for w in words if w))
+        self.top_k = top_k
+
+        self._blob = "".join(words)
+        self._offsets = array("I", [0])
+        for word in words:
+            self._offsets.append(self._offsets[-1] + len(word))
+
+        # Completion order: shortest words first unless a key is given
+        order = sorted(range(len(words)), key=lambda i: key(words[i]) if key else (len(words[i]), words[i]))
+        self._rank = array("I", bytes(4 * len(words)))
+        for rank, i in enumerate(order):
+            self._rank[i] = rank
+
+        self._build(words)
+
+    def _build(self, words):
+        lo, hi, depth, first_child = array("I"), array("I"), array("H"), array("I")
+        lo.append(0)
+        hi.append(len(words))
+        depth.append(0)
+
+        node = 0
+        while node < len(lo):
+            first_child.append(len(lo))
+            start, end, d = lo[node], hi[node], depth[node]
+            if start < end and len(words[start]) == d:
+                start += 1  # the prefix itself is a word
+            while start < end:
+                # Group the words sharing the next character
+                char = words[start][d]
+                stop = start + 1
+                while stop < end and words[stop][d] == char:
+                    stop += 1
+                lo.append(start)
+                hi.append(stop)
+                depth.append(_common_prefix_length(words[start], words[stop - 1]))
+                start = stop
+            node += 1
+        first_child.append(len(lo))
+
+        self._lo, self._hi, self._depth, self._first_child = lo, hi, depth, first_child
+
+        # Precompute top-k lists bottom up by merging the children's lists
+        rank = self._rank.__getitem__
+        top_offset = array("i", [-1]) * len(lo)
+        pool = array("I")
+        merged = [None] * len(lo)
+        for node in reversed(range(len(lo))):
+            count = hi[node] - lo[node]
+            if count <= self.top_k:
+                merged[node] = sorted(range(lo[node], hi[node]), key=rank)
+                continue
+            candidates = [lo[node]] if len(words[lo[node]]) == depth[node] else []
+            for child in range(first_child[node], first_child[node + 1]):
+                candidates.extend(merged[child])
+                merged[child] = None
+            merged[node] = heapq.nsmallest(self.top_k, candidates, key=rank)
+            top_offset[node] = len(pool)
+            pool.extend(merged[node])
+        self._top_offset, self._pool = top_offset, pool
+
+    @property
+    def nbytes(self):
+        arrays = (self._offsets, self._rank, self._lo, self._hi, self._depth,
+                  self._first_child, self._top_offset, self._pool)
+        # Sinhala text is stored with two bytes per character
+        return sum(a.itemsize * len(a) for a in arrays) + 2 * len(self._blob)
+
+    def word(self, i):
+        return self._blob[self._offsets[i]:self._offsets[i + 1]]
+
+    def _find(self, prefix):
+        # Node whose prefix starts with the given prefix, or -1
+        node, pos = 0, 0
+        while pos < len(prefix):
+            children_lo, children_hi = self._first_child[node], self._first_child[node + 1]
+            char = prefix[pos]
+            d = self._depth[node]
+            # Children are ordered by the first character of their edge
+            while children_lo < children_hi:
+                mid = (children_lo + children_hi) // 2
+                if self._blob[self._offsets[self._lo[mid]] + d] < char:
+                    children_lo = mid + 1
+                else:
+                    children_hi = mid
+            child = children_lo
+            if child == self._first_child[node + 1]:
+                return -1
+            word = self.word(self._lo[child])
+            if word[d] != char:
+                return -1
+            edge_end = self._depth[child]
+            length = min(edge_end, len(prefix)) - pos
+            if word[pos:pos + length] != prefix[pos:pos + length]:
+                return -1
+            node, pos = child, pos + length
+        return node
+
+    def complete(self, prefix, limit=None):
+        limit = min(limit or self.top_k, self.top_k)
+        node = self._find(unicodedata.normalize("NFC", prefix))
+        if node < 0:
+            return []
+        offset = self._top_offset[node]
+        if offset >= 0:
+            indices = self._pool[offset:offset + limit]
+        else:
+            indices = sorted(range(self._lo[node], self._hi[node]), key=self._rank.__getitem__)[:limit]
+        return [self.word(i) for i in indices]
+
+
+def _common_prefix_length(a, b):
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
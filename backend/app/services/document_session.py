@@ -0,0 +1,243 @@
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from itertools import count
+
+from app.services.spell_checker import check_word, known_word
+from app.utils.tokenizer import SINHALA, tokenize
+
+# A sentence runs up to a terminator (., ?, !, kunddaliya) or a line break
+SENTENCE_PATTERN = re.compile(r"[^.!?෴\n]+[.!?෴]*")
+
+
+class SessionError(ValueError):
+    pass
+
+
+class Sentence:
+    __slots__ = ("start", "end", "text", "corrections")
+
+    def __init__(self, start, end, text, corrections):
+        self.start = start
+        self.end = end
+        self.text = text
+        # Corrections with offsets relative to the sentence start
+        self.corrections = corrections
+
+
+class DocumentSession:
+    def __init__(self, session_id, sinhala_dictionary, max_document_chars, word_cache_size):
+        self.session_id = session_id
+        self.sinhala_dictionary = sinhala_dictionary
+        self.max_document_chars = max_document_chars
+        self.word_cache_size = word_cache_size
+
+        self.text = ""
+        self.sentences = []
+        self.version = 0
+        self.last_active = time.monotonic()
+
+        self._word_cache = OrderedDict()  # word -> (correction, distance)
+        self._correction_ids = count(1)
+        # Edits run in the thread pool, and several sockets may share a session
+        self._lock = threading.Lock()
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    def apply(self, message):
+        # Translate an edit message into a replacement of [start, end)
+        if not isinstance(message, dict):
+            raise SessionError("Messages must be JSON objects")
+        op = message.get("op")
+        if op == "set":
+            return self.replace(0, len(self.text), message.get("text", ""))
+        if op == "insert":
+            start = message.get("start")
+            return self.replace(start, start, message.get("text", ""))
+        if op == "delete":
+            return self.replace(message.get("start"), message.get("end"), "")
+        if op == "replace":
+            return self.replace(message.get("start"), message.get("end"), message.get("text", ""))
+        raise SessionError(f"Unknown op: {op!r}")
+
+    def replace(self, start, end, new_text):
+        with self._lock:
+            return self._replace(start, end, new_text)
+
+    def _replace(self, start, end, new_text):
+        if not isinstance(start, int) or not isinstance(end, int) or not isinstance(new_text, str):
+            raise SessionError("start and end must be integers and text a string")
+        if not 0 <= start <= end <= len(self.text):
+            raise SessionError(f"Range [{start}, {end}) is outside the document")
+        if len(self.text) - (end - start) + len(new_text) > self.max_document_chars:
+            raise SessionError(f"Document exceeds {self.max_document_chars} characters")
+
+        delta = len(new_text) - (end - start)
+        self.text = self.text[:start] + new_text + self.text[end:]
+
+        # Sentences touching the edit, widened by one neighbour on each side so
+        # that merged or split sentence boundaries are picked up
+        starts = [s.start for s in self.sentences]
+        ends = [s.end for s in self.sentences]
+        first = max(bisect_left(ends, start) - 1, 0)
+        last = min(bisect_right(starts, end) + 1, len(self.sentences))
+
+        # The region runs up to the next untouched sentence so that any
+        # separators between sentences are re-scanned as well
+        region_start = min(self.sentences[first].start, start) if first < last else 0
+        if last < len(self.sentences):
+            region_end = self.sentences[last].start + delta
+        else:
+            region_end = len(self.text)
+
+        old_sentences = self.sentences[first:last]
+        reusable = {}
+        for sentence in old_sentences:
+            reusable.setdefault(sentence.text, []).append(sentence)
+
+        new_sentences = []
+        added = []
+        for match in SENTENCE_PATTERN.finditer(self.text, region_start, region_end):
+            text = match.group()
+            candidates = reusable.get(text)
+            if candidates:
+                # Unchanged sentence text keeps its corrections and their ids
+                sentence = candidates.pop(0)
+                sentence.start, sentence.end = match.start(), match.end()
+            else:
+                sentence = Sentence(match.start(), match.end(), text, self._check(text))
+                added.extend(self._absolute(sentence, c) for c in sentence.corrections)
+            new_sentences.append(sentence)
+
+        removed = [
+            c["id"]
+            for sentences in reusable.values()
+            for sentence in sentences
+            for c in sentence.corrections
+        ]
+
+        for sentence in self.sentences[last:]:
+            sentence.start += delta
+            sentence.end += delta
+        self.sentences[first:last] = new_sentences
+        self.version += 1
+
+        return {
+            "type": "diff",
+            "version": self.version,
+            "added": added,
+            "removed": removed,
+        }
+
+    def corrections(self):
+        with self._lock:
+            return self._corrections()
+
+    def snapshot(self):
+        # Version and corrections read together, for a client (re)connecting
+        with self._lock:
+            return self.version, self._corrections()
+
+    def _corrections(self):
+        return [
+            self._absolute(sentence, c)
+            for sentence in self.sentences
+            for c in sentence.corrections
+        ]
+
+    def _check(self, text):
+        corrections = []
+        for token in tokenize(text):
+            if token.kind != SINHALA:
+                continue
+            correction, distance = self._check_word(token.normalized)
+            if correction not in (token.normalized, token.text):
+                corrections.append({
+                    "id": next(self._correction_ids),
+                    "start": token.start,
+                    "end": token.end,
+                    "word": token.text,
+                    "correction": correction,
+                    "distance": distance,
+                })
+        return corrections
+
+    def _check_word(self, word):
+        cached = self._word_cache.get(word)
+        if cached is not None:
+            self._word_cache.move_to_end(word)
+            return cached
+
+        if known_word(word, self.sinhala_dictionary):
+            result = (word, 0)
+        else:
+            top_words = check_word(word, self.sinhala_dictionary, top_n=1)
+            result = top_words[0] if top_words else (word, None)
+
+        self._word_cache[word] = result
+        if len(self._word_cache) > self.word_cache_size:
+            self._word_cache.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _absolute(sentence, correction):
+        return {
+            **correction,
+            "start": sentence.start + correction["start"],
+            "end": sentence.start + correction["end"],
+        }
+
+
+class SessionStore:
+    def __init__(self, sinhala_dictionary, max_sessions, idle_timeout,
+                 max_document_chars, word_cache_size):
+        self.sinhala_dictionary = sinhala_dictionary
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_document_chars = max_document_chars
+        self.word_cache_size = word_cache_size
+        self._sessions = OrderedDict()  # least recently used first
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get_or_create(self, session_id=None):
+        # Returns (session, resumed). An unknown or expired id is not reused:
+        # the client gets a fresh id and must send its document again
+        self.expire()
+
+        session = self._sessions.get(session_id) if session_id else None
+        resumed = session is not None
+        if session is None:
+            session = DocumentSession(
+                uuid.uuid4().hex,
+                self.sinhala_dictionary,
+                self.max_document_chars,
+                self.word_cache_size,
+            )
+            self._sessions[session.session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+        self.touch(session)
+        return session, resumed
+
+    def expire(self):
+        deadline = time.monotonic() - self.idle_timeout
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_active > deadline:
+                break
+            del self._sessions[session.session_id]
+
+    def touch(self, session):
+        session.touch()
+        if session.session_id in self._sessions:
+            self._sessions.move_to_end(session.session_id)
+
+    def discard(self, session_id):
+        self._sessions.pop(session_id, None)
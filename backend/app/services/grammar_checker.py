@@ -0,0 +1,199 @@
+import csv
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+# Cascade stages, cheapest first
+STAGE_EXACT_MATCH = "exact_match"
+STAGE_HEURISTIC = "heuristic"
+STAGE_MODEL = "model"
+
+HEURISTIC_CONFIDENCE = 0.9
+
+
+class GrammarModelUnavailable(RuntimeError):
+    pass
+
+
+def sentence_key(text):
+    return hashlib.blake2b(" ".join(text.split()).encode("utf-8"), digest_size=8).digest()
+
+
+def load_sentence_index(file_path):
+    # Hash every known sentence to (has_error, correction)
+    index = {}
+    if not os.path.exists(file_path):
+        return index
+    with open(file_path, encoding="utf-8", newline="") as f:
+        rows = [(row["incorrect_sentence"], row["correct_sentence"]) for row in csv.DictReader(f)]
+    for incorrect, correct in rows:
+        index.setdefault(sentence_key(incorrect), (1, correct))
+    # A sentence listed as correct anywhere is treated as correct
+    for _, correct in rows:
+        index[sentence_key(correct)] = (0, None)
+    return index
+
+
+def load_heuristics(file_path):
+    # Agreement tables, shared with the legacy app
+    with open(file_path, encoding="utf-8") as f:
+        tables = json.load(f)
+    return {
+        "subject_verb_endings": tables["subject_verb_endings"],
+        "formal_verb": re.compile(tables["formal_verb_pattern"]),
+        "coordinators": set(tables["coordinators"]),
+    }
+
+
+def check_heuristics(words, heuristics):
+    # Only a definite agreement violation is decided here: a subject pronoun
+    # first, a formal verb last with the other person's ending, and nothing in
+    # between that could change the subject. Sentences that agree or cannot be
+    # decided return None and go to the model.
+    if len(words) < 2:
+        return None
+    expected = heuristics["subject_verb_endings"].get(words[0])
+    if expected is None or heuristics["coordinators"].intersection(words[1:-1]):
+        return None
+
+    verb = words[-1]
+    # Words that only happen to end like a verb (භූමි) do not match
+    match = heuristics["formal_verb"].search(verb)
+    if match is None or match.group("ending") == expected:
+        return None
+    return 1, " ".join(words[:-1] + [verb[:match.start("ending")] + expected])
+
+
+class GrammarChecker:
+    def __init__(self, model_path, sentence_index, heuristics, max_length=512, retry_interval=300):
+        self.model_path = model_path
+        self.sentence_index = sentence_index
+        self.heuristics = heuristics
+        self.max_length = max_length
+        self.retry_interval = retry_interval
+        self.tokenizer = None
+        self.model = None
+        self.device = None
+        self._load_lock = threading.Lock()
+        # (monotonic time, message) of the last failed load
+        self._load_failure = None
+        self._stats_lock = threading.Lock()
+        self.stats = {STAGE_EXACT_MATCH: 0, STAGE_HEURISTIC: 0, STAGE_MODEL: 0}
+
+    @property
+    def model_calls_avoided(self):
+        return self.stats[STAGE_EXACT_MATCH] + self.stats[STAGE_HEURISTIC]
+
+    def load_model(self):
+        # torch and transformers are only imported once a sentence needs the model
+        with self._load_lock:
+            if self.model is not None:
+                return
+            # A failed load is not retried on every request, only after retry_interval
+            if self._load_failure is not None:
+                failed_at, message = self._load_failure
+                if time.monotonic() - failed_at < self.retry_interval:
+                    raise GrammarModelUnavailable(message)
+            try:
+                self._load_model()
+            except GrammarModelUnavailable as e:
+                self._load_failure = (time.monotonic(), str(e))
+                raise
+            except Exception as e:
+                # Corrupt or unreadable files (OSError, bad config) fall back the same way
+                message = f"Grammar model at {self.model_path} could not be loaded: {e}"
+                self._load_failure = (time.monotonic(), message)
+                raise GrammarModelUnavailable(message) from e
+            self._load_failure = None
+
+    def _load_model(self):
+        if not os.path.exists(os.path.join(self.model_path, "config.json")):
+            raise GrammarModelUnavailable(f"Grammar model not found at {self.model_path}")
+
+        try:
+            import torch
+            from transformers import (
+                XLMRobertaConfig,
+                XLMRobertaForSequenceClassification,
+                XLMRobertaTokenizer,
+            )
+        except ImportError as e:
+            raise GrammarModelUnavailable(f"Grammar model needs torch and transformers: {e}")
+
+        with open(os.path.join(self.model_path, "config.json")) as f:
+            config_dict = json.load(f)
+        self.tokenizer = XLMRobertaTokenizer.from_pretrained(
+            self.model_path, model_max_length=config_dict["max_length"]
+        )
+        config = XLMRobertaConfig.from_pretrained(
+            self.model_path,
+            num_labels=config_dict["num_labels"],
+            vocab_size=config_dict["vocab_size"],
+            max_position_embeddings=config_dict["max_position_embeddings"],
+            type_vocab_size=config_dict["type_vocab_size"],
+        )
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        model = XLMRobertaForSequenceClassification.from_pretrained(
+            self.model_path, config=config, ignore_mismatched_sizes=True
+        )
+        model.eval()
+        self.model = model.to(self.device)
+
+    def predict(self, text):
+        self.load_model()
+        import torch
+
+        inputs = self.tokenizer(
+            text,
+            return_tensors="pt",
+            truncation=True,
+            max_length=self.max_length,
+            padding="max_length",
+        )
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        with torch.no_grad():
+            predictions = torch.softmax(self.model(**inputs).logits, dim=1)
+        has_error = torch.argmax(predictions).item()
+        return has_error, predictions[0][has_error].item()
+
+    def check(self, text):
+        text = text.strip()
+        words = text.split()
+
+        # Cheap stages first; the transformer only sees undecided sentences
+        known = self.sentence_index.get(sentence_key(text))
+        if known is not None:
+            has_error, correction = known
+            return self._result(text, has_error, 1.0, correction, STAGE_EXACT_MATCH)
+
+        decided = check_heuristics(words, self.heuristics)
+        if decided is not None:
+            has_error, correction = decided
+            return self._result(text, has_error, HEURISTIC_CONFIDENCE, correction, STAGE_HEURISTIC)
+
+        has_error, confidence = self.predict(text)
+        return self._result(text, has_error, confidence, None, STAGE_MODEL)
+
+    def _result(self, text, has_error, confidence, correction, stage):
+        problematic_words = []
+        if has_error and correction:
+            for i, (incorrect, correct) in enumerate(zip(text.split(), correction.split())):
+                if incorrect != correct:
+                    problematic_words.append({"word": incorrect, "position": i, "correction": correct})
+
+        # Checks run on several threads at once
+        with self._stats_lock:
+            self.stats[stage] += 1
+            model_calls_avoided = self.model_calls_avoided
+        return {
+            "text": text,
+            "has_error": bool(has_error),
+            "confidence": confidence,
+            "correction": correction,
+            "problematic_words": problematic_words,
+            "stage": stage,
+            "model_calls_avoided": model_calls_avoided,
+        }
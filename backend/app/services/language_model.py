@@ -0,0 +1,156 @@
+import json
+import math
+import os
+from collections import Counter
+
+import numpy as np
+
+from app.utils.tokenizer import SENTENCE_END, SENTENCE_START, SINHALA, ZWJ, normalize_word
+from app.utils.tokenizer import tokenize as tokenize_text
+
+# Bumped whenever the tokens change; artifacts built otherwise must be rebuilt
+TOKENIZATION = "sinhala-normalized-v1"
+
+UNKNOWN = "<unk>"
+
+# Log10 probabilities are clipped to [-LOGP_FLOOR, 0] and stored in one byte
+LOGP_FLOOR = 10.0
+QUANT_LEVELS = 255
+# Stupid backoff: each step down to a shorter context costs log10(0.4)
+BACKOFF_LOG10 = math.log10(0.4)
+
+
+def quantize(logp):
+    logp = np.clip(np.asarray(logp, dtype=np.float64), -LOGP_FLOOR, 0.0)
+    return np.rint(-logp / LOGP_FLOOR * QUANT_LEVELS).astype(np.uint8)
+
+
+def model_key(word):
+    # The same key at build and query time: normalized, and ZWJ-insensitive
+    # because the dictionary and corpora disagree on yansaya/rakaransaya joins
+    return normalize_word(word).replace(ZWJ, "")
+
+
+def tokenize(sentence):
+    # Sinhala words only, as check_sentence sees them; punctuation, numbers
+    # and Latin text are not part of the context
+    words = [model_key(t.text) for t in tokenize_text(sentence) if t.kind == SINHALA]
+    return [SENTENCE_START] + words + [SENTENCE_END]
+
+
+def build_language_model(sentences, output_dir, order=3):
+    # Count every n-gram up to the given order
+    counts = [Counter() for _ in range(order)]
+    for sentence in sentences:
+        tokens = tokenize(sentence)
+        for n in range(1, order + 1):
+            for i in range(len(tokens) - n + 1):
+                counts[n - 1][tuple(tokens[i:i + n])] += 1
+
+    vocab = sorted({gram[0] for gram in counts[0]} | {UNKNOWN})
+    ids = {word: i for i, word in enumerate(vocab)}
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Level 1 is indexed directly by word id; deeper levels hold the children
+    # of each node contiguously, sorted by word id, in the parent's order
+    unigram_total = sum(counts[0].values())
+    unigram_logp = np.full(len(vocab), -LOGP_FLOOR)
+    for (word,), count in counts[0].items():
+        unigram_logp[ids[word]] = math.log10(count / unigram_total)
+    np.save(os.path.join(output_dir, "logp_1.npy"), quantize(unigram_logp))
+
+    parents = [(ids[word],) for word in vocab]
+    for n in range(2, order + 1):
+        grams = sorted(
+            (tuple(ids[w] for w in gram), count) for gram, count in counts[n - 1].items()
+        )
+        parent_index = {parent: i for i, parent in enumerate(parents)}
+        child_offsets = np.zeros(len(parents) + 1, dtype=np.uint32)
+        word_ids = np.empty(len(grams), dtype=np.uint32)
+        logp = np.empty(len(grams))
+        for i, (gram, count) in enumerate(grams):
+            child_offsets[parent_index[gram[:-1]] + 1] += 1
+            word_ids[i] = gram[-1]
+            prefix = tuple(vocab[w] for w in gram[:-1])
+            logp[i] = math.log10(count / counts[n - 2][prefix])
+        np.cumsum(child_offsets, out=child_offsets)
+
+        np.save(os.path.join(output_dir, f"offsets_{n - 1}.npy"), child_offsets)
+        np.save(os.path.join(output_dir, f"words_{n}.npy"), word_ids)
+        np.save(os.path.join(output_dir, f"logp_{n}.npy"), quantize(logp))
+        parents = [gram for gram, _ in grams]
+
+    with open(os.path.join(output_dir, "vocab.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(vocab))
+    with open(os.path.join(output_dir, "meta.json"), "w") as f:
+        json.dump({
+            "order": order,
+            "tokenization": TOKENIZATION,
+            "vocab_size": len(vocab),
+            "ngrams": [len(c) for c in counts],
+            "logp_floor": LOGP_FLOOR,
+            "quant_levels": QUANT_LEVELS,
+        }, f, indent=2)
+
+
+class NgramLanguageModel:
+    def __init__(self, model_dir):
+        with open(os.path.join(model_dir, "meta.json")) as f:
+            meta = json.load(f)
+        if meta.get("tokenization") != TOKENIZATION:
+            raise ValueError(
+                f"Language model in {model_dir} was built with different tokens; "
+                "rebuild it with scripts.build_language_model"
+            )
+        with open(os.path.join(model_dir, "vocab.txt"), encoding="utf-8") as f:
+            vocab = f.read().split("\n")
+
+        self.order = meta["order"]
+        self._ids = {word: i for i, word in enumerate(vocab)}
+        self._unknown_id = self._ids[UNKNOWN]
+        step = meta["logp_floor"] / meta["quant_levels"]
+        self._dequantize = [-q * step for q in range(256)]
+
+        # Arrays are memory-mapped so worker processes share the page cache
+        def load(name):
+            return np.load(os.path.join(model_dir, name), mmap_mode="r")
+
+        self._logp = [None] + [load(f"logp_{n}.npy") for n in range(1, self.order + 1)]
+        self._words = [None, None] + [load(f"words_{n}.npy") for n in range(2, self.order + 1)]
+        self._offsets = [None] + [load(f"offsets_{n}.npy") for n in range(1, self.order)]
+
+    @property
+    def nbytes(self):
+        arrays = [a for group in (self._logp, self._words, self._offsets) for a in group if a is not None]
+        return sum(a.nbytes for a in arrays)
+
+    def _find(self, ids):
+        # Walk the trie from the first word; returns the node index or -1
+        node = ids[0]
+        for n in range(2, len(ids) + 1):
+            offsets = self._offsets[n - 1]
+            lo, hi = int(offsets[node]), int(offsets[node + 1])
+            if lo == hi:
+                return -1
+            words = self._words[n]
+            i = lo + int(np.searchsorted(words[lo:hi], ids[n - 1]))
+            if i == hi or words[i] != ids[n - 1]:
+                return -1
+            node = i
+        return node
+
+    def score(self, word, history=()):
+        # Log10 probability of word after history, with stupid backoff
+        word_id = self._ids.get(model_key(word), self._unknown_id)
+        context = [
+            self._ids.get(w if w == SENTENCE_START else model_key(w), self._unknown_id)
+            for w in history
+        ][-(self.order - 1):]
+        penalty = 0.0
+        while context:
+            node = self._find(context + [word_id])
+            if node >= 0:
+                return penalty + self._dequantize[self._logp[len(context) + 1][node]]
+            penalty += BACKOFF_LOG10
+            context = context[1:]
+        return penalty + self._dequantize[self._logp[1][word_id]]
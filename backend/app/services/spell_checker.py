@@ -1,4 +1,12 @@
+import heapq
+
 import Levenshtein
+from app.config import (
+    LANGUAGE_MODEL_CANDIDATES,
+    LANGUAGE_MODEL_MAX_EXTRA_DISTANCE,
+    LANGUAGE_MODEL_WEIGHT,
+)
+from app.utils.tokenizer import SENTENCE_START, SINHALA, tokenize, word_variants
 from app.utils.utils import sinhala_to_ipa
 
 def spell_check(word, ipa_list, top_n=3):
@@ -12,43 +20,97 @@ def spell_check(word, ipa_list, top_n=3):
     return word_distances[:top_n]
 
 
-def check_sentence(sentence, sinhala_dictionary):
-    ipa_list = sinhala_dictionary["IPA"]  # List of IPA representations
-    ipa_to_word = sinhala_dictionary["word"]  # Map IPA to actual words
+def check_word(word, sinhala_dictionary, top_n=3, overlay=None):
+    ipa = sinhala_to_ipa(word)
+    top_words = _lookup(ipa, sinhala_dictionary, top_n)
+    if overlay is not None:
+        # Merge the user's own words with the shared dictionary's suggestions
+        top_words = heapq.nsmallest(
+            top_n, top_words + _lookup(ipa, overlay, top_n), key=lambda x: x[1]
+        )
+    return top_words
+
+
+def _lookup(ipa, dictionary, top_n):
+    ipa_list = dictionary["IPA"]  # List of IPA representations
+    ipa_to_word = dictionary["word"]  # Map IPA to actual words
+
+    # Get top suggestions based on IPA, converted back to actual words
+    top_words = spell_check(ipa, ipa_list, top_n=top_n)
+    return [(ipa_to_word.get(match, match), distance) for match, distance in top_words]
+
+
+def rerank(top_words, history, language_model, weight=LANGUAGE_MODEL_WEIGHT,
+           max_extra_distance=LANGUAGE_MODEL_MAX_EXTRA_DISTANCE):
+    # Prefer candidates that fit the preceding words, but only among those
+    # within max_extra_distance of the closest one: a word missing from the
+    # model scores about -10, which would otherwise outweigh several edits.
+    # Further candidates keep their distance order behind them.
+    if not top_words:
+        return top_words
+    best = min(distance for _, distance in top_words)
+    close = [c for c in top_words if c[1] <= best + max_extra_distance]
+    far = [c for c in top_words if c[1] > best + max_extra_distance]
+    close.sort(key=lambda candidate: candidate[1] - weight * language_model.score(candidate[0], history))
+    return close + far
 
-    words = sentence.split()  # Split the sentence into words
-    corrected_words = []  # Store corrected words
-    suggestions = {}  # Store suggestions for each word
 
-    for word in words:
-        # Get top suggestions based on IPA
-        top_words = spell_check(sinhala_to_ipa(word), ipa_list, top_n=3)
-        if top_words:
-            # Get the actual word for the top IPA suggestion
-            corrected_word = ipa_to_word.get(top_words[0][0], word)
-            corrected_words.append(corrected_word)
+def known_word(word, sinhala_dictionary, overlay=None):
+    # Exact dictionary words need no search; ZWJ spelling variants count too
+    for variant in word_variants(word):
+        if variant in sinhala_dictionary["known_words"]:
+            return variant
+        if overlay is not None and variant in overlay["known_words"]:
+            return variant
+    return None
 
-            # Add all suggestions (converted from IPA to actual words)
-            suggestions[word] = [
-                (ipa_to_word.get(ipa, ipa), distance) for ipa, distance in top_words
-            ]
+
+def check_sentence(sentence, sinhala_dictionary, language_model=None, overlay=None):
+    pieces = []  # Corrected text, token by token
+    corrected_words = []  # Corrected Sinhala words, the context for reranking
+    corrections = []  # Store corrections with their offsets
+
+    for token in tokenize(sentence):
+        # Only Sinhala words are searched; everything else is kept as is
+        if token.kind != SINHALA:
+            pieces.append(token.text)
+            continue
+
+        word = token.normalized
+        known = known_word(word, sinhala_dictionary, overlay)
+        if known:
+            pieces.append(token.text)
+            corrected_words.append(known)
+            continue
+
+        if language_model is None:
+            top_words = check_word(word, sinhala_dictionary, top_n=3, overlay=overlay)
         else:
-            corrected_words.append(word)  # Use original word if no suggestion
-            suggestions[word] = [("No suggestion", None)]  # No suggestions available
+            top_words = check_word(word, sinhala_dictionary, top_n=LANGUAGE_MODEL_CANDIDATES, overlay=overlay)
+            history = [SENTENCE_START] + corrected_words
+            top_words = rerank(top_words, history, language_model)[:3]
 
-    # Combine corrected words into a sentence
-    corrected_sentence = " ".join(corrected_words)
+        # The top suggestion is the correction; keep the word if there is none
+        correction, distance = top_words[0] if top_words else (word, None)
+        corrected_words.append(correction)
+        if correction == word:
+            pieces.append(token.text)
+        else:  # Only include actual corrections
+            pieces.append(correction)
+            corrections.append({
+                "word": token.text,
+                "correction": correction,
+                "distance": distance,
+                "start": token.start,
+                "end": token.end,
+            })
 
-    print("sentence", sentence, "corrected_sentence", corrected_sentence, "suggestions", suggestions)
+    # Rebuild the sentence around the corrected words
+    corrected_sentence = "".join(pieces)
 
-    # Return original sentence, corrected sentence, and suggestions
+    # Return original sentence, corrected sentence, and corrections
     return {
-    "original_sentence": sentence,
-    "corrected_sentence": corrected_sentence,
-    "corrections": [
-        {"word": word, "correction": sugg[0][0], "distance": sugg[0][1]}
-        for word, sugg in suggestions.items()
-        if sugg[0][0] != word  # Only include actual corrections
-    ]
-}
-
+        "original_sentence": sentence,
+        "corrected_sentence": corrected_sentence,
+        "corrections": corrections,
+    }
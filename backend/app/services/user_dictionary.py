@@ -0,0 +1,180 @@
+import csv
+import hashlib
+import hmac
+import os
+import re
+import secrets
+import threading
+import weakref
+from collections import OrderedDict
+
+from app.utils.utils import sinhala_to_ipa
+
+USER_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+class UserDictionaryError(ValueError):
+    pass
+
+
+class UserDictionary:
+    # Per-user words layered over the shared dictionary. It has the same shape
+    # as load_dictionary() so the spell checker can search it the same way.
+
+    def __init__(self, user_id, path, max_words, lock=None):
+        self.user_id = user_id
+        self.path = path
+        self.max_words = max_words
+        # Shared by every object for the same file; see UserDictionaryStore.get
+        self._lock = lock or threading.Lock()
+        with self._lock:
+            self._load()
+
+    def __len__(self):
+        return len(self._known)
+
+    def __contains__(self, word):
+        return word in self._known
+
+    def _reset(self):
+        self._known = set()
+        self.data = {"IPA": [], "word": {}, "words": [], "known_words": self._known}
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self):
+        self._reset()
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    self._index(row["word"], row["IPA"])
+        self._stamp = self._file_stamp()
+
+    def _refresh(self):
+        # An evicted object for the same user may still have written to the
+        # file; read it again so a rewrite does not drop those words
+        if self._file_stamp() != self._stamp:
+            self._load()
+
+    def _index(self, word, ipa):
+        # Appending keeps the overlay searchable without any rebuild
+        self.data["IPA"].append(ipa)
+        self.data["word"].setdefault(ipa, word)
+        self.data["words"].append(word)
+        self._known.add(word)
+
+    def add(self, words):
+        with self._lock:
+            self._refresh()
+            new_words = list(dict.fromkeys(
+                w.strip() for w in words if w.strip() and w.strip() not in self._known
+            ))
+            if len(self) + len(new_words) > self.max_words:
+                raise UserDictionaryError(f"User dictionary is limited to {self.max_words} words")
+
+            rows = [(word, sinhala_to_ipa(word)) for word in new_words]
+            write_header = not os.path.exists(self.path)
+            with open(self.path, "a", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                if write_header:
+                    writer.writerow(["word", "IPA"])
+                writer.writerows(rows)
+            for word, ipa in rows:
+                self._index(word, ipa)
+            self._stamp = self._file_stamp()
+            return new_words
+
+    def remove(self, word):
+        with self._lock:
+            self._refresh()
+            if word not in self:
+                return False
+            rows = [(w, ipa) for w, ipa in zip(self.data["words"], self.data["IPA"]) if w != word]
+            with open(self.path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["word", "IPA"])
+                writer.writerows(rows)
+            self._reset()
+            for w, ipa in rows:
+                self._index(w, ipa)
+            self._stamp = self._file_stamp()
+            return True
+
+
+def validate_user_id(user_id):
+    # The id becomes a file name, so anything else (including a trailing
+    # newline or a non-string from a JSON body) is refused
+    if not isinstance(user_id, str) or not USER_ID_PATTERN.fullmatch(user_id):
+        raise UserDictionaryError("user_id may only contain letters, digits, '_' and '-'")
+
+
+def hash_token(token):
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class UserDictionaryStore:
+    # Keeps the most recently used overlays in memory; the rest stay on disk
+    # and are loaded again on their next use. Each user gets a random token
+    # when created; only its hash is stored, next to the user's words.
+
+    def __init__(self, directory, max_words, max_loaded):
+        self.directory = directory
+        self.max_words = max_words
+        self.max_loaded = max_loaded
+        self._loaded = OrderedDict()  # least recently used first
+        self._lock = threading.Lock()
+        # One lock per user for as long as any object for that user exists,
+        # including one evicted while a request still uses it
+        self._user_locks = weakref.WeakValueDictionary()
+        os.makedirs(directory, exist_ok=True)
+
+    def _token_path(self, user_id):
+        return os.path.join(self.directory, f"{user_id}.token")
+
+    def create(self):
+        # Returns (user_id, token); the token is not kept and cannot be recovered
+        token = secrets.token_urlsafe(32)
+        while True:
+            user_id = secrets.token_hex(8)
+            try:
+                with open(self._token_path(user_id), "x") as f:
+                    f.write(hash_token(token))
+            except FileExistsError:
+                continue
+            return user_id, token
+
+    def authenticate(self, user_id, token):
+        validate_user_id(user_id)
+        if not isinstance(token, str) or not token:
+            return False
+        try:
+            with open(self._token_path(user_id)) as f:
+                expected = f.read().strip()
+        except FileNotFoundError:
+            return False
+        return hmac.compare_digest(hash_token(token), expected)
+
+    def get(self, user_id):
+        validate_user_id(user_id)
+
+        with self._lock:
+            dictionary = self._loaded.get(user_id)
+            if dictionary is None:
+                path = os.path.join(self.directory, f"{user_id}.csv")
+                lock = self._user_locks.get(user_id)
+                if lock is None:
+                    lock = self._user_locks[user_id] = threading.Lock()
+                dictionary = UserDictionary(user_id, path, self.max_words, lock)
+                self._loaded[user_id] = dictionary
+                while len(self._loaded) > self.max_loaded:
+                    self._loaded.popitem(last=False)
+            self._loaded.move_to_end(user_id)
+            return dictionary
+
+    def loaded_count(self):
+        return len(self._loaded)
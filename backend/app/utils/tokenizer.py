@@ -0,0 +1,67 @@
+import re
+import unicodedata
+from collections import namedtuple
+
+ZWJ = "\u200d"
+ZWNJ = "\u200c"
+
+SINHALA = "sinhala"
+LATIN = "latin"
+NUMBER = "number"
+URL = "url"
+SPACE = "space"
+PUNCT = "punct"
+
+# Sentence boundaries as the language model sees them. Defined here so the
+# spell checker can build a history without importing the model and numpy.
+SENTENCE_START = "<s>"
+SENTENCE_END = "</s>"
+
+# Alternatives are tried in order; the last one takes any single character,
+# so the tokens always cover the whole text. An email is only tried where a
+# run of [\w.+-] starts: trying it inside the run would scan the rest of the
+# run again at every position, which is quadratic on text such as "a.a.a.".
+TOKEN_PATTERN = re.compile(
+    r"(?P<url>(?:https?://|www\.)\S+|(?<![\w.+-])[\w.+-]+@[\w-]+(?:\.[\w-]+)+)"
+    r"|(?P<sinhala>[\u0d81-\u0df3](?:[\u0d81-\u0df3\u200c\u200d]*[\u0d81-\u0df3])?)"
+    r"|(?P<number>\d+(?:[.,:/]\d+)*)"
+    r"|(?P<latin>[^\W\d_\u0d80-\u0dff]+(?:['’][^\W\d_\u0d80-\u0dff]+)*)"
+    r"|(?P<space>\s+)"
+    r"|(?P<punct>.)",
+    re.DOTALL,
+)
+
+# Variants used when looking a word up: with and without a ZWJ joining the
+# virama to a following ය or ර (yansaya and rakaransaya)
+VIRAMA_WITHOUT_ZWJ = re.compile("්(?=[යර])")
+REPEATED_ZWJ = re.compile(ZWJ + "{2,}")
+DROP_ZWNJ = str.maketrans("", "", ZWNJ)
+
+Token = namedtuple("Token", ["text", "start", "end", "kind", "normalized"])
+
+
+def normalize_word(text):
+    # NFC so composed and decomposed vowel signs compare equal; ZWNJ never
+    # changes a Sinhala word, and repeated ZWJ collapse to one
+    text = unicodedata.normalize("NFC", text).translate(DROP_ZWNJ)
+    return REPEATED_ZWJ.sub(ZWJ, text)
+
+
+def word_variants(word):
+    yield word
+    joined = VIRAMA_WITHOUT_ZWJ.sub("්" + ZWJ, word)
+    if joined != word:
+        yield joined
+    if ZWJ in word:
+        yield word.replace(ZWJ, "")
+
+
+def tokenize(text):
+    # Offsets refer to the original text, so "".join(t.text) == text
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        token_text = match.group()
+        normalized = normalize_word(token_text) if kind == SINHALA else token_text
+        tokens.append(Token(token_text, match.start(), match.end(), kind, normalized))
+    return tokens
@@ -1,11 +1,16 @@
-import pandas as pd
+import csv
 
 def load_dictionary(file_path):
-    # Load the Sinhala dictionary CSV file
-    df = pd.read_csv(file_path)
+    # Load the Sinhala dictionary CSV file; the csv module keeps pandas out
+    # of the serving path, which matters for worker start-up time
+    with open(file_path, encoding="utf-8", newline="") as f:
+        rows = [(row["word"], row["IPA"]) for row in csv.DictReader(f)]
+    words = [word for word, _ in rows]
     return {
-        "IPA": df["IPA"].tolist(),
-        "word": df.set_index("IPA")["word"].to_dict(),
+        "IPA": [ipa for _, ipa in rows],
+        "word": {ipa: word for word, ipa in rows},
+        "words": words,  # Every word, including IPA duplicates
+        "known_words": set(words),  # Exact matches skip the search
     }
 
 def sinhala_to_ipa(text):
@@ -0,0 +1,52 @@
+"""Measure prefix completion latency and memory against a plain dict of words.
+
+Run from the backend directory:
+    python -m scripts.benchmark_completion
+"""
+import argparse
+import random
+import sys
+import time
+
+from app.config import COMPLETION_TOP_K, DICTIONARY_PATH
+from app.services.completion import CompletionTrie
+from app.utils.utils import load_dictionary
+
+
+def dict_of_strings_bytes(words):
+    index = {word: None for word in words}
+    return sys.getsizeof(index) + sum(sys.getsizeof(word) for word in index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prefix completion")
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    words = load_dictionary(DICTIONARY_PATH)["words"]
+
+    start = time.perf_counter()
+    trie = CompletionTrie(words, top_k=COMPLETION_TOP_K)
+    print(f"build: {time.perf_counter() - start:.2f}s for {len(words)} words")
+    print(f"memory: trie {trie.nbytes / 1e6:.2f} MB, dict of strings {dict_of_strings_bytes(words) / 1e6:.2f} MB")
+
+    rng = random.Random(args.seed)
+    prefixes = []
+    for _ in range(args.queries):
+        word = rng.choice(words)
+        prefixes.append(word[:rng.randint(1, len(word))])
+
+    latencies = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        trie.complete(prefix)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e6
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+    print(f"lookup: p50 {p50:.1f} us, p99 {p99:.1f} us over {len(latencies)} prefixes")
+
+
+if __name__ == "__main__":
+    main()
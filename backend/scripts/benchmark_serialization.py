@@ -0,0 +1,110 @@
+"""Compare response encodings: stdlib json against orjson, full against compact
+payloads, and their size raw, gzipped and brotli compressed.
+
+The encoders alone hide what FastAPI adds, so each payload is also sent
+through an endpoint twice: once returned as a dict and validated against the
+response model, once returned as an ORJSONResponse as check_spelling does.
+
+Synthetic spell check results are built from dictionary words so the payloads
+have the same shape and script as real responses.
+
+Run from the backend directory:
+    python -m scripts.benchmark_serialization
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+from typing import Union
+
+import orjson
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+from app.config import DICTIONARY_PATH
+from app.core.compression import brotli
+from app.models.schemas import CompactSpellCheckResponse, SpellCheckResponse, to_compact
+from app.utils.utils import load_dictionary
+
+TARGET_SIZES = {"1KB": 1_000, "1MB": 1_000_000}
+
+
+def synthetic_result(words, target_size, rng, typo_rate=0.2):
+    # Grow a sentence until its full JSON encoding is roughly the target size;
+    # each word appears in both sentences and each correction adds ~100 bytes
+    pieces, corrections, offset, size = [], [], 0, 0
+    while size < target_size:
+        word = rng.choice(words)
+        size += 2 * (len(word.encode("utf-8")) + 1)
+        if rng.random() < typo_rate:
+            correction = rng.choice(words)
+            corrections.append({
+                "word": word,
+                "correction": correction,
+                "distance": rng.randint(1, 3),
+                "start": offset,
+                "end": offset + len(word),
+            })
+            size += 80 + len(word.encode("utf-8")) + len(correction.encode("utf-8"))
+        pieces.append(word)
+        offset += len(word) + 1
+    sentence = " ".join(pieces)
+    return {"original_sentence": sentence, "corrected_sentence": sentence, "corrections": corrections}
+
+
+def time_call(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def endpoint_client(payloads):
+    # Both routes return the payload under test; only the response path differs
+    app = FastAPI()
+
+    @app.get("/validated", response_model=Union[SpellCheckResponse, CompactSpellCheckResponse])
+    def validated():
+        return payloads["current"]
+
+    @app.get("/direct", response_model=Union[SpellCheckResponse, CompactSpellCheckResponse])
+    def direct():
+        return ORJSONResponse(payloads["current"])
+
+    return TestClient(app)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    words = load_dictionary(DICTIONARY_PATH)["words"]
+    rng = random.Random(args.seed)
+    payloads = {}
+    client = endpoint_client(payloads)
+
+    print(f"{'document':<10}{'format':<9}{'json ms':>9}{'orjson ms':>11}{'validated ms':>14}{'direct ms':>11}"
+          f"{'raw B':>10}{'gzip B':>10}{'br B':>10}")
+    for label, target_size in TARGET_SIZES.items():
+        result = synthetic_result(words, target_size, rng)
+        for name, payload in (("full", result), ("compact", to_compact(result))):
+            stdlib_time = time_call(lambda: json.dumps(payload, ensure_ascii=False).encode("utf-8"), args.repeat)
+            orjson_time = time_call(lambda: orjson.dumps(payload), args.repeat)
+            payloads["current"] = payload
+            validated_time = time_call(lambda: client.get("/validated"), args.repeat)
+            direct_time = time_call(lambda: client.get("/direct"), args.repeat)
+            body = orjson.dumps(payload)
+            gzip_size = len(gzip.compress(body, compresslevel=6))
+            br_size = len(brotli.compress(body, quality=4)) if brotli is not None else None
+            print(f"{label:<10}{name:<9}{stdlib_time * 1e3:>9.3f}{orjson_time * 1e3:>11.3f}"
+                  f"{validated_time * 1e3:>14.3f}{direct_time * 1e3:>11.3f}"
+                  f"{len(body):>10}{gzip_size:>10}{br_size if br_size is not None else '-':>10}")
+
+
+if __name__ == "__main__":
+    main()
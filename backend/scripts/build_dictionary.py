@@ -0,0 +1,148 @@
+"""Build a versioned dictionary artifact with IPA regenerated by sinhala_to_ipa.
+
+Every source CSV (word, IPA) is read, entries are deduplicated by word and
+the IPA of each word is regenerated in parallel with the same converter used
+for query words at runtime. Differences between the sources and between the
+stored and regenerated IPA are reported. Regenerated IPA is cached per
+converter version, so after adding rows only the new words are converted.
+
+Run from the backend directory:
+    python -m scripts.build_dictionary --install app/utils/sinhala_dict_with_ipa.csv
+"""
+import argparse
+import csv
+import hashlib
+import inspect
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import time
+
+from app.utils.utils import sinhala_to_ipa
+
+DEFAULT_SOURCES = ["app/utils/sinhala_dict_with_ipa.csv", "../legacy/data/sinhala_dict_with_ipa.csv"]
+DEFAULT_BUILD_DIR = "build/dictionary"
+
+
+def converter_fingerprint():
+    # Cached IPA is only valid for the converter that produced it
+    return hashlib.sha256(inspect.getsource(sinhala_to_ipa).encode("utf-8")).hexdigest()[:16]
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def read_source(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return [(row["word"].strip(), row["IPA"].strip()) for row in csv.DictReader(f) if row["word"].strip()]
+
+
+def compare_sources(sources):
+    # Words missing from a source or stored with a different IPA
+    maps = {path: dict(rows) for path, rows in sources.items()}
+    all_words = set().union(*maps.values())
+    missing = {path: len(all_words - words.keys()) for path, words in maps.items()}
+    conflicting = sum(
+        1 for word in all_words
+        if len({m[word] for m in maps.values() if word in m}) > 1
+    )
+    return missing, conflicting
+
+
+def load_cache(path, fingerprint):
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("converter") == fingerprint:
+            return cache["ipa"]
+    return {}
+
+
+def save_cache(path, fingerprint, ipa):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"converter": fingerprint, "ipa": ipa}, f, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Sinhala dictionary artifact")
+    parser.add_argument("sources", nargs="*", default=DEFAULT_SOURCES, help="word,IPA CSV files")
+    parser.add_argument("--build-dir", default=DEFAULT_BUILD_DIR)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--keep-source-ipa", action="store_true",
+                        help="emit the stored IPA instead of the regenerated one")
+    parser.add_argument("--install", nargs="*", default=[], metavar="PATH",
+                        help="copy the artifact over these dictionary files")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    os.makedirs(args.build_dir, exist_ok=True)
+    sources = {path: read_source(path) for path in args.sources}
+
+    missing, conflicting = compare_sources(sources)
+    for path, count in missing.items():
+        print(f"{path}: {len(sources[path])} rows, {count} words missing compared to the other sources")
+    print(f"{conflicting} words have different IPA across sources")
+
+    # Deduplicate by word; the first source listed wins
+    entries = {}
+    for rows in sources.values():
+        for word, ipa in rows:
+            entries.setdefault(word, ipa)
+
+    fingerprint = converter_fingerprint()
+    cache_path = os.path.join(args.build_dir, "ipa_cache.json")
+    generated = load_cache(cache_path, fingerprint)
+    new_words = [word for word in entries if word not in generated]
+    if new_words:
+        with multiprocessing.Pool(args.workers) as pool:
+            generated.update(zip(new_words, pool.map(sinhala_to_ipa, new_words, chunksize=1000)))
+        save_cache(cache_path, fingerprint, generated)
+    print(f"Converted {len(new_words)} words, reused {len(entries) - len(new_words)} cached")
+
+    mismatches = [(word, ipa, generated[word]) for word, ipa in entries.items() if ipa != generated[word]]
+    mismatch_path = os.path.join(args.build_dir, "ipa_mismatches.csv")
+    with open(mismatch_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["word", "stored_IPA", "generated_IPA"])
+        writer.writerows(mismatches)
+    print(f"{len(mismatches)} of {len(entries)} words have stored IPA that differs from "
+          f"sinhala_to_ipa (see {mismatch_path})")
+
+    buffer = io.StringIO(newline="")
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["word", "IPA"])
+    for word, ipa in entries.items():
+        writer.writerow([word, ipa if args.keep_source_ipa else generated[word]])
+    content = buffer.getvalue().encode("utf-8")
+
+    # The artifact is named after its content, so identical builds share a version
+    version = hashlib.sha256(content).hexdigest()[:12]
+    artifact = os.path.join(args.build_dir, f"sinhala_dict-{version}.csv")
+    with open(artifact, "wb") as f:
+        f.write(content)
+
+    manifest = {
+        "version": version,
+        "artifact": os.path.basename(artifact),
+        "rows": len(entries),
+        "ipa": "source" if args.keep_source_ipa else "generated",
+        "converter": fingerprint,
+        "ipa_mismatches": len(mismatches),
+        "sources": {path: file_hash(path) for path in args.sources},
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    with open(os.path.join(args.build_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    for path in args.install:
+        shutil.copyfile(artifact, path)
+        print(f"Installed {artifact} to {path}")
+    print(f"Built {artifact} ({len(entries)} words) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Build the n-gram language model used to rerank spelling candidates.
+
+Run from the backend directory:
+    python -m scripts.build_language_model path/to/merged_sentences.csv
+"""
+import argparse
+import csv
+import time
+
+from app.config import LANGUAGE_MODEL_PATH
+from app.services.language_model import build_language_model
+
+
+def read_sentences(path, column):
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            sentence = (row.get(column) or "").strip()
+            if sentence:
+                yield sentence
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the n-gram language model")
+    parser.add_argument("sentences", help="CSV file with one sentence per row")
+    parser.add_argument("--column", default="correct_sentence")
+    parser.add_argument("--order", type=int, default=3)
+    parser.add_argument("--output", default=LANGUAGE_MODEL_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    build_language_model(read_sentences(args.sentences, args.column), args.output, args.order)
+    print(f"Built {args.order}-gram model in {args.output} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Spell check large corpora with a pool of worker processes.
+
+Input files are streamed line by line; every non-empty line is checked as one
+sentence and written to a JSONL file in input order. Progress is checkpointed
+so an interrupted run continues where it stopped when started again with
+--resume.
+
+Run from the backend directory:
+    python -m scripts.bulk_check corpus1.txt corpus2.txt -o results.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+
+from app.dependencies import get_language_model, get_sinhala_dictionary
+from app.services.spell_checker import check_sentence
+
+CHECKPOINT_INTERVAL = 5.0  # seconds
+
+
+def init_worker():
+    # Each worker loads the dictionary and model once
+    get_sinhala_dictionary()
+    get_language_model()
+
+
+def check_chunk(lines):
+    dictionary = get_sinhala_dictionary()
+    language_model = get_language_model()
+    results = []
+    for path, line_no, sentence in lines:
+        if sentence:
+            result = check_sentence(sentence, dictionary, language_model)
+            results.append(json.dumps(
+                {"file": path, "line": line_no, **result}, ensure_ascii=False
+            ) + "\n")
+    return results
+
+
+def read_lines(paths):
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                yield path, line_no, line.strip()
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def load_checkpoint(path, inputs):
+    if not os.path.exists(path):
+        return 0, 0
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint["inputs"] != inputs:
+        sys.exit(f"Checkpoint {path} was written for different inputs: {checkpoint['inputs']}")
+    return checkpoint["lines"], checkpoint["output_bytes"]
+
+
+def save_checkpoint(path, inputs, lines, output_bytes):
+    # Written to a temporary file first so a crash never leaves it half written
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"inputs": inputs, "lines": lines, "output_bytes": output_bytes}, f)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spell check large corpora to JSONL")
+    parser.add_argument("inputs", nargs="+", help="UTF-8 text files, one sentence per line")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=64, help="lines per task")
+    parser.add_argument("--max-pending", type=int, default=4, help="tasks in flight per worker")
+    parser.add_argument("--checkpoint", help="defaults to OUTPUT.checkpoint")
+    parser.add_argument("--resume", action="store_true", help="continue from the checkpoint")
+    args = parser.parse_args()
+
+    inputs = [os.path.abspath(p) for p in args.inputs]
+    checkpoint_path = args.checkpoint or args.output + ".checkpoint"
+    done_lines, output_bytes = load_checkpoint(checkpoint_path, inputs) if args.resume else (0, 0)
+
+    if done_lines and not os.path.exists(args.output):
+        # The checkpoint outlived its output; nothing usable has been written
+        print(f"{args.output} does not exist; starting from the beginning", file=sys.stderr)
+        done_lines, output_bytes = 0, 0
+
+    # Drop anything written after the last checkpoint
+    output = open(args.output, "r+b" if done_lines else "wb")
+    output.truncate(output_bytes)
+    output.seek(output_bytes)
+
+    lines = islice(read_lines(inputs), done_lines, None)
+    max_pending = args.workers * args.max_pending
+    pending = deque()
+    sentences = 0
+    start = last_checkpoint = time.perf_counter()
+
+    with multiprocessing.Pool(args.workers, initializer=init_worker) as pool:
+        chunks = chunked(lines, args.chunk_size)
+        while True:
+            # Bounded number of chunks in flight keeps memory flat on any corpus size
+            for chunk in islice(chunks, max_pending - len(pending)):
+                pending.append((len(chunk), pool.apply_async(check_chunk, (chunk,))))
+            if not pending:
+                break
+
+            line_count, result = pending.popleft()
+            records = result.get()
+            output.write("".join(records).encode("utf-8"))
+            done_lines += line_count
+            sentences += len(records)
+
+            now = time.perf_counter()
+            if now - last_checkpoint >= CHECKPOINT_INTERVAL:
+                output.flush()
+                save_checkpoint(checkpoint_path, inputs, done_lines, output.tell())
+                last_checkpoint = now
+                print(f"{done_lines} lines, {sentences / (now - start):.1f} sentences/s",
+                      file=sys.stderr)
+
+    output.close()
+    elapsed = time.perf_counter() - start
+    save_checkpoint(checkpoint_path, inputs, done_lines, os.path.getsize(args.output))
+    print(f"Checked {sentences} sentences in {elapsed:.1f}s "
+          f"({sentences / max(elapsed, 1e-9):.1f} sentences/s, {args.workers} workers)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Guard the tokenizer against inputs that make its regex super-linear.
+
+Each adversarial pattern is tokenized at a small and a four times larger
+size. Linear tokenizing takes about four times longer; the check fails when
+the larger input takes more than GROWTH_LIMIT times as long, or when a
+document of SESSION_MAX_DOCUMENT_CHARS takes longer than the budget. Run it
+in CI or after changing TOKEN_PATTERN.
+
+Run from the backend directory:
+    python -m scripts.check_tokenizer --budget-ms 1000
+"""
+import argparse
+import sys
+import time
+
+from app.config import SESSION_MAX_DOCUMENT_CHARS
+from app.utils.tokenizer import tokenize
+
+DEFAULT_BUDGET_MS = 1000
+# Quadratic growth would be 16x; allow timing noise on top of the linear 4x
+GROWTH_LIMIT = 8
+SMALL_CHARS = 20_000
+
+# Runs that an alternative could rescan from every position
+ADVERSARIAL = {
+    "email run": "a.",
+    "email plus": "a+",
+    "at signs": "a@",
+    "number": "1.",
+    "url prefix": "www",
+    "apostrophes": "a'",
+    "sinhala zwj": "ක‍",
+    "latin words": "ab ",
+}
+
+
+def best_time(text, runs):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        tokenize(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that tokenizing stays linear")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3, help="the fastest run is used")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'pattern':<14}{'20k ms':>9}{'80k ms':>9}{'growth':>8}{'max doc ms':>12}")
+    for name, unit in ADVERSARIAL.items():
+        def sized(chars):
+            return unit * (chars // len(unit))
+
+        small = best_time(sized(SMALL_CHARS), args.runs)
+        large = best_time(sized(4 * SMALL_CHARS), args.runs)
+        document = best_time(sized(SESSION_MAX_DOCUMENT_CHARS), 1)
+        growth = large / max(small, 1e-6)
+        print(f"{name:<14}{small * 1e3:>9.1f}{large * 1e3:>9.1f}{growth:>8.1f}{document * 1e3:>12.1f}")
+        if growth > GROWTH_LIMIT:
+            failures.append(f"{name}: 4x the input took {growth:.1f}x as long")
+        if document * 1e3 > args.budget_ms:
+            failures.append(
+                f"{name}: {SESSION_MAX_DOCUMENT_CHARS} characters took {document * 1e3:.0f} ms, "
+                f"over the {args.budget_ms:.0f} ms budget"
+            )
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
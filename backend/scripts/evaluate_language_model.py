@@ -0,0 +1,87 @@
+"""Report memory, scoring throughput and correction accuracy of the n-gram model.
+
+Accuracy is measured on sentence pairs whose incorrect and correct versions
+have the same number of words, with and without reranking.
+
+Run from the backend directory:
+    python -m scripts.evaluate_language_model path/to/merged_sentences.csv --limit 200
+"""
+import argparse
+import csv
+import os
+import time
+
+from app.config import DICTIONARY_PATH, LANGUAGE_MODEL_PATH
+from app.services.language_model import NgramLanguageModel, tokenize
+from app.services.spell_checker import check_sentence
+from app.utils.utils import load_dictionary
+
+
+def read_pairs(path):
+    # Both versions come from the same row, so a row with one empty cell is
+    # skipped instead of shifting every later pair
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            incorrect = (row.get("incorrect_sentence") or "").strip()
+            correct = (row.get("correct_sentence") or "").strip()
+            if incorrect and correct:
+                yield incorrect, correct
+
+
+def scoring_throughput(model, sentences):
+    calls = 0
+    start = time.perf_counter()
+    for sentence in sentences:
+        tokens = tokenize(sentence)
+        for i in range(1, len(tokens)):
+            model.score(tokens[i], tokens[:i])
+            calls += 1
+    elapsed = time.perf_counter() - start
+    return calls, elapsed
+
+
+def word_accuracy(pairs, dictionary, model):
+    # Over all words, and over the misspelled words alone, where reranking
+    # actually decides something
+    correct = total = fixed = misspelled = 0
+    start = time.perf_counter()
+    for incorrect, expected in pairs:
+        result = check_sentence(incorrect, dictionary, model)
+        for typed, got, want in zip(incorrect.split(), result["corrected_sentence"].split(), expected.split()):
+            correct += got == want
+            total += 1
+            if typed != want:
+                fixed += got == want
+                misspelled += 1
+    return correct / max(total, 1), fixed / max(misspelled, 1), misspelled, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the n-gram language model")
+    parser.add_argument("sentences", help="CSV with incorrect_sentence and correct_sentence columns")
+    parser.add_argument("--model", default=LANGUAGE_MODEL_PATH)
+    parser.add_argument("--limit", type=int, default=200, help="sentence pairs used for accuracy")
+    args = parser.parse_args()
+
+    model = NgramLanguageModel(args.model)
+    vocab_bytes = os.path.getsize(os.path.join(args.model, "vocab.txt"))
+    print(f"memory: {model.nbytes / 1e6:.2f} MB arrays (mmap), {vocab_bytes / 1e6:.2f} MB vocabulary")
+
+    all_pairs = list(read_pairs(args.sentences))
+    calls, elapsed = scoring_throughput(model, [correct for _, correct in all_pairs])
+    print(f"scoring: {calls} tokens in {elapsed:.2f}s, {elapsed / max(calls, 1) * 1e6:.1f} us/token")
+
+    pairs = [
+        (incorrect, correct)
+        for incorrect, correct in all_pairs
+        if len(incorrect.split()) == len(correct.split())
+    ][:args.limit]
+    dictionary = load_dictionary(DICTIONARY_PATH)
+    for name, lm in (("distance only", None), ("reranked", model)):
+        accuracy, fixed, misspelled, elapsed = word_accuracy(pairs, dictionary, lm)
+        print(f"{name:14s} word accuracy {accuracy:.3f}, misspelled words fixed {fixed:.3f} of {misspelled} "
+              f"over {len(pairs)} sentences ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""Measure how spelling search settings trade correction quality for speed.
+
+A labelled misspelling set is built from the dictionary by swapping one
+consonant of a word for its aspirated or unaspirated partner (ක/ඛ, ද/ධ, ...),
+the confusion writers make most often. The pairs are read from sinhala_to_ipa
+itself: two consonants pair up when their IPA differs only by ʰ or ʱ. Every
+search backend and parameter setting then corrects the same misspellings and
+is reported with accuracy@1, accuracy@3, latency and memory. Settings that no
+other setting beats on all of accuracy@1, p50 latency and memory are marked
+as the Pareto front.
+
+Run from the backend directory:
+    python -m scripts.evaluate_search --samples 500
+"""
+import argparse
+import heapq
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from collections import defaultdict
+
+import Levenshtein
+from app.config import DICTIONARY_PATH, LANGUAGE_MODEL_CANDIDATES, LANGUAGE_MODEL_WEIGHT
+from app.dependencies import get_language_model
+from app.services.spell_checker import check_word, rerank
+from app.utils.tokenizer import SENTENCE_START
+from app.utils.utils import load_dictionary, sinhala_to_ipa
+
+try:
+    from rapidfuzz import process
+except ImportError:  # The rapidfuzz rows are skipped without it
+    process = None
+
+SINHALA_CONSONANTS = [chr(c) for c in range(0x0D9A, 0x0DC7)]
+ASPIRATION_MARKS = ("ʰ", "ʱ")
+TOP_N = 3
+
+
+def aspiration_pairs():
+    # Consonant -> its aspirated or unaspirated partner, in both directions
+    by_ipa = {}
+    for consonant in SINHALA_CONSONANTS:
+        ipa = sinhala_to_ipa(consonant).split()
+        if ipa:
+            by_ipa.setdefault(ipa[0], consonant)
+    pairs = {}
+    for ipa, consonant in by_ipa.items():
+        for mark in ASPIRATION_MARKS:
+            partner = by_ipa.get(ipa + mark)
+            if partner:
+                pairs[consonant] = partner
+                pairs[partner] = consonant
+    return pairs
+
+
+def build_misspellings(dictionary, pairs, samples, seed):
+    # (misspelling, intended word) pairs. Only words the search can return are
+    # used: several words can share an IPA and the dictionary keeps one of them.
+    # Swaps that produce another real word are skipped, since any answer is valid.
+    rng = random.Random(seed)
+    candidates = [
+        word for ipa, word in dictionary["word"].items()
+        if any(char in pairs for char in word)
+    ]
+    rng.shuffle(candidates)
+    misspellings = []
+    for word in candidates:
+        positions = [i for i, char in enumerate(word) if char in pairs]
+        i = rng.choice(positions)
+        misspelled = word[:i] + pairs[word[i]] + word[i + 1:]
+        if misspelled not in dictionary["known_words"]:
+            misspellings.append((misspelled, word))
+        if len(misspellings) == samples:
+            break
+    return misspellings
+
+
+def words_for(matches, ipa_to_word):
+    return [(ipa_to_word.get(ipa, ipa), distance) for ipa, distance in matches]
+
+
+# Each backend returns (search, index) where search(word, top_n) gives the
+# top_n (word, distance) suggestions and index is any structure it built
+
+def scan_backend(dictionary):
+    # What check_sentence does today: every distance, then a full sort
+    return (lambda word, top_n: check_word(word, dictionary, top_n=top_n)), None
+
+
+def heap_backend(dictionary):
+    ipa_list, ipa_to_word = dictionary["IPA"], dictionary["word"]
+
+    def search(word, top_n):
+        ipa = sinhala_to_ipa(word)
+        matches = heapq.nsmallest(
+            top_n, ((c, Levenshtein.distance(ipa, c)) for c in ipa_list), key=lambda x: x[1]
+        )
+        return words_for(matches, ipa_to_word)
+
+    return search, None
+
+
+def cutoff_backend(dictionary, max_distance):
+    # Bounded distance: the C loop stops once a candidate is further than
+    # max_distance; candidates beyond it are never suggested
+    ipa_list, ipa_to_word = dictionary["IPA"], dictionary["word"]
+
+    def search(word, top_n):
+        ipa = sinhala_to_ipa(word)
+        matches = []
+        for candidate in ipa_list:
+            distance = Levenshtein.distance(ipa, candidate, score_cutoff=max_distance)
+            if distance <= max_distance:
+                matches.append((candidate, distance))
+        matches.sort(key=lambda x: x[1])
+        return words_for(matches[:top_n], ipa_to_word)
+
+    return search, None
+
+
+def length_index_backend(dictionary, max_distance):
+    # Candidates bucketed by length; a word whose length differs by more than
+    # max_distance cannot be within max_distance, so those buckets are skipped
+    ipa_to_word = dictionary["word"]
+    buckets = defaultdict(list)
+    for candidate in dictionary["IPA"]:
+        buckets[len(candidate)].append(candidate)
+
+    def search(word, top_n):
+        ipa = sinhala_to_ipa(word)
+        matches = []
+        for length in range(len(ipa) - max_distance, len(ipa) + max_distance + 1):
+            for candidate in buckets.get(length, ()):
+                distance = Levenshtein.distance(ipa, candidate, score_cutoff=max_distance)
+                if distance <= max_distance:
+                    matches.append((candidate, distance))
+        matches.sort(key=lambda x: x[1])
+        return words_for(matches[:top_n], ipa_to_word)
+
+    return search, buckets
+
+
+def rapidfuzz_backend(dictionary, max_distance):
+    # The whole scan in C; max_distance None means unbounded
+    ipa_list, ipa_to_word = dictionary["IPA"], dictionary["word"]
+
+    def search(word, top_n):
+        ipa = sinhala_to_ipa(word)
+        matches = process.extract(
+            ipa, ipa_list, scorer=Levenshtein.distance, limit=top_n, score_cutoff=max_distance
+        )
+        return words_for([(candidate, distance) for candidate, distance, _ in matches], ipa_to_word)
+
+    return search, None
+
+
+def language_model_backend(dictionary, language_model, weight):
+    # Isolated words have no context, so this reranks by the unigram prior
+    def search(word, top_n):
+        top_words = check_word(word, dictionary, top_n=LANGUAGE_MODEL_CANDIDATES)
+        return rerank(top_words, [SENTENCE_START], language_model, weight)[:top_n]
+
+    return search, None
+
+
+def settings(language_model):
+    yield "scan", "full sort", scan_backend, {}
+    yield "heap", "nsmallest", heap_backend, {}
+    for k in (1, 2, 3):
+        yield "score_cutoff", f"max_distance={k}", cutoff_backend, {"max_distance": k}
+    for k in (1, 2, 3):
+        yield "length_index", f"max_distance={k}", length_index_backend, {"max_distance": k}
+    if process is not None:
+        for k in (None, 2, 3):
+            yield "rapidfuzz", f"max_distance={k}", rapidfuzz_backend, {"max_distance": k}
+    if language_model is not None:
+        for weight in (0.25, LANGUAGE_MODEL_WEIGHT, 1.0):
+            yield "lm_rerank", f"weight={weight}", language_model_backend, {
+                "language_model": language_model, "weight": weight,
+            }
+
+
+def build(factory, dictionary, params):
+    # Memory is what building the backend allocates on top of the dictionary
+    tracemalloc.start()
+    search, index = factory(dictionary, **params)
+    index_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return search, index_bytes
+
+
+def query_peak_bytes(search, misspellings, queries=20):
+    # Peak allocation of a single query, measured apart from the timed run
+    peak = 0
+    for misspelled, _ in misspellings[:queries]:
+        tracemalloc.start()
+        search(misspelled, TOP_N)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peak
+
+
+def evaluate(search, misspellings):
+    hits_1 = hits_3 = 0
+    latencies = []
+    for misspelled, intended in misspellings:
+        start = time.perf_counter()
+        suggestions = search(misspelled, TOP_N)
+        latencies.append(time.perf_counter() - start)
+        words = [word for word, _ in suggestions]
+        hits_1 += words[:1] == [intended]
+        hits_3 += intended in words
+    latencies.sort()
+    return {
+        "acc@1": hits_1 / len(misspellings),
+        "acc@3": hits_3 / len(misspellings),
+        "p50_ms": statistics.median(latencies) * 1e3,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1e3,
+    }
+
+
+def mark_pareto(rows):
+    # A row is on the front unless another is at least as good on accuracy@1,
+    # p50 latency and memory, and strictly better on one of them. Memory is
+    # compared in whole KB so allocator noise does not decide the front.
+    def cost(row):
+        return (-row["acc@1"], row["p50_ms"], round((row["index_bytes"] + row["query_peak_bytes"]) / 1e3))
+
+    for row in rows:
+        row["pareto"] = not any(
+            all(a <= b for a, b in zip(cost(other), cost(row))) and cost(other) != cost(row)
+            for other in rows
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate spelling search settings")
+    parser.add_argument("--samples", type=int, default=500, help="misspellings to correct")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", action="append", help="only these backends (repeatable)")
+    parser.add_argument("--output", help="also write the rows as JSON")
+    args = parser.parse_args()
+
+    dictionary = load_dictionary(DICTIONARY_PATH)
+    pairs = aspiration_pairs()
+    misspellings = build_misspellings(dictionary, pairs, args.samples, args.seed)
+    print(f"{len(misspellings)} misspellings from {len(pairs) // 2} aspiration pairs: "
+          + " ".join(sorted({"/".join(sorted(p)) for p in pairs.items()})))
+
+    language_model = get_language_model()
+    if language_model is None:
+        print("No language model built; lm_rerank rows are skipped")
+    if process is None:
+        print("rapidfuzz is not installed; rapidfuzz rows are skipped")
+
+    rows = []
+    for backend, setting, factory, params in settings(language_model):
+        if args.backend and backend not in args.backend:
+            continue
+        search, index_bytes = build(factory, dictionary, params)
+        row = {"backend": backend, "setting": setting, **evaluate(search, misspellings)}
+        row["index_bytes"] = index_bytes
+        row["query_peak_bytes"] = query_peak_bytes(search, misspellings)
+        rows.append(row)
+        print(f"  {backend} {setting}: acc@1 {row['acc@1']:.3f}, p50 {row['p50_ms']:.2f} ms", flush=True)
+
+    mark_pareto(rows)
+    rows.sort(key=lambda row: row["p50_ms"])
+    print(f"\n{'':2}{'backend':<14}{'setting':<18}{'acc@1':>7}{'acc@3':>7}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'index MB':>10}{'query KB':>10}")
+    for row in rows:
+        print(f"{'*' if row['pareto'] else '':2}{row['backend']:<14}{row['setting']:<18}"
+              f"{row['acc@1']:>7.3f}{row['acc@3']:>7.3f}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}"
+              f"{row['index_bytes'] / 1e6:>10.2f}{row['query_peak_bytes'] / 1e3:>10.1f}")
+    print("* Pareto front: no other setting is as accurate at @1, as fast at p50 and as small")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"samples": len(misspellings), "seed": args.seed, "rows": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Drive the API with a configurable request mix and report throughput against latency.
+
+The app is either called in-process through the ASGI transport, served by a
+local uvicorn started for each worker count, or reached at an existing URL.
+Every combination of worker count and concurrency is run for a fixed
+duration with closed-loop clients.
+
+Run from the backend directory:
+    python -m scripts.loadtest --mode uvicorn --workers 1,2,4 --concurrency 1,8,32
+    python -m scripts.loadtest --mode inprocess --mix short=1 --duration 5
+"""
+import argparse
+import asyncio
+import contextlib
+import csv
+import json
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.config import DICTIONARY_PATH
+
+DEFAULT_MIX = "short=6,long=2,batch=1,grammar=1"
+
+
+def load_words(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return [row["word"] for row in csv.DictReader(f)]
+
+
+def make_word(rng, words, typo_rate):
+    # Misspelled words take the full search path; known words skip it
+    word = rng.choice(words)
+    if rng.random() < typo_rate:
+        i = rng.randrange(len(word))
+        word = word[:i] + rng.choice(rng.choice(words)) + word[i + 1:]
+    return word
+
+
+def make_sentence(rng, words, low, high, typo_rate=0.0):
+    return " ".join(make_word(rng, words, typo_rate) for _ in range(rng.randint(low, high)))
+
+
+def make_request(kind, rng, words, typo_rate=0.0):
+    # (method, path, json body) for one request of the given kind
+    if kind == "short":
+        return "/api/v1/check_spelling", {"sentence": make_sentence(rng, words, 3, 8, typo_rate)}
+    if kind == "long":
+        return "/api/v1/check_spelling", {"sentence": make_sentence(rng, words, 80, 150, typo_rate)}
+    if kind == "batch":
+        return "/api/v1/check_spelling/batch", {
+            "sentences": [make_sentence(rng, words, 3, 8, typo_rate) for _ in range(20)]
+        }
+    if kind == "grammar":
+        return "/api/v1/check_grammar", {"sentence": make_sentence(rng, words, 3, 8, typo_rate)}
+    raise ValueError(f"Unknown request kind: {kind}")
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        mix[kind.strip()] = float(weight or 1)
+    return mix
+
+
+def percentile(values, q):
+    # Latency in milliseconds, or None when nothing succeeded
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] * 1000
+
+
+def format_ms(value):
+    return f"{value:8.1f} ms" if value is not None else "     n/a   "
+
+
+async def run_point(client, mix, words, concurrency, duration, seed, typo_rate):
+    kinds, weights = list(mix), list(mix.values())
+    latencies = {kind: [] for kind in kinds}
+    errors = {kind: 0 for kind in kinds}
+    deadline = time.perf_counter() + duration
+
+    async def user(index):
+        rng = random.Random(seed + index)
+        while time.perf_counter() < deadline:
+            kind = rng.choices(kinds, weights)[0]
+            path, body = make_request(kind, rng, words, typo_rate)
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json=body)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies[kind].append(time.perf_counter() - start)
+            else:
+                errors[kind] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "concurrency": concurrency,
+        "requests": len(all_latencies),
+        "errors": sum(errors.values()),
+        "throughput": len(all_latencies) / elapsed,
+        "p50_ms": percentile(all_latencies, 0.50),
+        "p95_ms": percentile(all_latencies, 0.95),
+        "p99_ms": percentile(all_latencies, 0.99),
+        "by_kind": {
+            kind: {
+                "requests": len(latencies[kind]),
+                "errors": errors[kind],
+                "p50_ms": percentile(latencies[kind], 0.50),
+                "p99_ms": percentile(latencies[kind], 0.99),
+            }
+            for kind in kinds
+        },
+    }
+
+
+@contextlib.contextmanager
+def uvicorn_server(workers, port):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        for _ in range(600):
+            try:
+                if httpx.get(base_url + "/").status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+        else:
+            raise RuntimeError("uvicorn did not start")
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def run_series(client, args, mix, words, workers):
+    # Warm up so dictionary loading is not counted as latency
+    for kind in mix:
+        path, body = make_request(kind, random.Random(0), words)
+        with contextlib.suppress(httpx.HTTPError):
+            await client.post(path, json=body)
+
+    results = []
+    for concurrency in args.concurrency:
+        point = await run_point(client, mix, words, concurrency, args.duration, args.seed, args.typo_rate)
+        point["workers"] = workers
+        results.append(point)
+        print(f"workers {workers:3d}  concurrency {concurrency:4d}  "
+              f"{point['throughput']:8.1f} req/s  p50 {format_ms(point['p50_ms'])}  "
+              f"p95 {format_ms(point['p95_ms'])}  p99 {format_ms(point['p99_ms'])}  "
+              f"errors {point['errors']}", file=sys.stderr)
+    return results
+
+
+async def main_async(args):
+    mix = parse_mix(args.mix)
+    words = load_words(DICTIONARY_PATH)
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    results = []
+
+    if args.mode == "inprocess":
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest",
+                                     timeout=timeout) as client:
+            results += await run_series(client, args, mix, words, workers=1)
+    elif args.mode == "url":
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits) as client:
+            results += await run_series(client, args, mix, words, workers=None)
+    else:
+        for workers in args.workers:
+            with uvicorn_server(workers, args.port) as base_url:
+                async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+                    results += await run_series(client, args, mix, words, workers)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the spell checking API")
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn", "url"], default="uvicorn")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="target for --mode url")
+    parser.add_argument("--port", type=int, default=8765, help="port for --mode uvicorn")
+    parser.add_argument("--workers", type=lambda s: [int(x) for x in s.split(",")], default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=lambda s: [int(x) for x in s.split(",")], default=[1, 4, 16])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per point")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="kind=weight for short, long, batch, grammar")
+    parser.add_argument("--typo-rate", type=float, default=0.3, help="share of misspelled words")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", default="loadtest_report.json")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    with open(args.report, "w") as f:
+        json.dump({"mode": args.mode, "mix": parse_mix(args.mix), "results": results}, f, indent=2)
+    print(f"Report written to {args.report}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Report what importing the app costs and enforce a cold-start budget.
+
+Every run imports app.main in a fresh interpreter with -X importtime, lists
+the slowest modules by cumulative and self time, and exits non-zero when the
+import takes longer than the budget or pulls in a module that must only be
+loaded on demand (pandas, numpy behind the language model, or the ML stack
+behind the grammar model). Run it in CI or before a release to catch a slow
+import sneaking into the serving path.
+
+Run from the backend directory:
+    python -m scripts.profile_startup --budget-ms 800
+"""
+import argparse
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = 800
+# Modules the serving path may only import when a request needs them
+DEFERRED_MODULES = ["pandas", "numpy", "torch", "transformers", "datasets", "evaluate", "sklearn"]
+
+PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import app.main\n"
+    "print(time.perf_counter() - start)\n"
+    "print(','.join(sorted(m for m in sys.modules if '.' not in m)))\n"
+)
+
+
+def import_profile(target):
+    # Returns (wall seconds, top-level modules loaded, [(self_us, cumulative_us, module)])
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.replace("app.main", target)],
+        capture_output=True, text=True, check=True,
+    )
+    wall, modules = completed.stdout.splitlines()[-2:]
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return float(wall), set(modules.split(",")), entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile and budget the app's import time")
+    parser.add_argument("--target", default="app.main", help="module to import")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3, help="the fastest run is compared to the budget")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    runs = [import_profile(args.target) for _ in range(args.runs)]
+    wall, modules, entries = min(runs, key=lambda run: run[0])
+
+    print(f"{'cumulative ms':>14}{'self ms':>10}  module")
+    for self_us, cumulative_us, name in sorted(entries, key=lambda e: e[1], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1e3:>14.1f}{self_us / 1e3:>10.1f}  {name}")
+
+    print("\nslowest by self time:")
+    for self_us, _, name in sorted(entries, reverse=True)[:args.top // 2]:
+        print(f"{self_us / 1e3:>14.1f} ms  {name.strip()}")
+
+    failures = []
+    wall_ms = wall * 1e3
+    print(f"\nimport {args.target}: {wall_ms:.0f} ms (fastest of {args.runs}), budget {args.budget_ms:.0f} ms")
+    if wall_ms > args.budget_ms:
+        failures.append(f"import took {wall_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+    loaded = [name for name in DEFERRED_MODULES if name in modules]
+    if loaded:
+        failures.append(f"deferred modules imported at start-up: {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
+import os
 import httpx
 import asyncio
 from typing import Any, Optional
 from PySide6.QtCore import QObject, Signal, QThread, QRunnable, Slot
+from local_engine import get_local_engine
+
+
+# Where checks run: "http" (backend only), "local" (in-process only) or
+# "auto" (backend, falling back to the in-process engine when unreachable)
+ENGINE_MODE = os.environ.get("SINHALA_ENGINE", "auto")
 
 
 class APIWorker(QRunnable):
@@ -11,14 +18,33 @@ class APIWorker(QRunnable):
         finished = Signal(dict)
         error = Signal(str)
     
-    def __init__(self, sentence: str, base_url: str = "http://localhost:8000"):
+    def __init__(self, sentence: str, base_url: str = "http://localhost:8000",
+                 engine_mode: str = ENGINE_MODE):
         super().__init__()
         self.sentence = sentence
         self.base_url = base_url
+        self.engine_mode = engine_mode
         self.signals = APIWorker.Signals()
     
     @Slot()
     def run(self):
+        """Execute the check with the configured engine"""
+        if self.engine_mode == "local":
+            self._run_local()
+        else:
+            self._run_http()
+    
+    def _run_local(self, fallback_error: Optional[str] = None):
+        """Check the sentence with the in-process engine"""
+        try:
+            result = get_local_engine().check_spelling(self.sentence)
+        except Exception as e:
+            # As a fallback, the backend's error is the one the user can act on
+            self.signals.error.emit(fallback_error or str(e))
+            return
+        self.signals.finished.emit(result)
+    
+    def _run_http(self):
         """Execute the API call"""
         try:
             # Create a new event loop for this thread
@@ -35,11 +61,14 @@ class APIWorker(QRunnable):
                     return response.json()
             
             result = loop.run_until_complete(do_request())
-            print(result)
             loop.close()
             self.signals.finished.emit(result)
         except httpx.ConnectError:
-            self.signals.error.emit("Could not connect to the backend server. Make sure it's running on http://localhost:8000")
+            message = "Could not connect to the backend server. Make sure it's running on http://localhost:8000"
+            if self.engine_mode == "auto":
+                self._run_local(fallback_error=message)
+                return
+            self.signals.error.emit(message)
         except httpx.HTTPStatusError as e:
             self.signals.error.emit(f"Server returned status: {e.response.status_code}")
         except Exception as e:
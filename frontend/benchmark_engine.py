@@ -0,0 +1,78 @@
+"""
+Compare in-process spelling latency against the HTTP round trip.
+
+Usage: python benchmark_engine.py [--base-url URL] [--repeat N]
+The HTTP column is skipped when the backend is not running.
+"""
+
+import argparse
+import statistics
+import time
+
+import httpx
+
+from local_engine import get_local_engine
+
+
+SAMPLE_SENTENCES = [
+    "මම ගෙදර යනවා",
+    "ඔයා කොහෙද යන්නෙ",
+    "අද හොඳ දවසක්",
+    "ළමයි පාසලට ගියා",
+]
+
+
+def _summarize(latencies: list) -> str:
+    """Format mean and percentiles in milliseconds"""
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return (f"mean {statistics.mean(latencies) * 1000:8.2f} ms  "
+            f"p50 {statistics.median(latencies) * 1000:8.2f} ms  "
+            f"p95 {p95 * 1000:8.2f} ms")
+
+
+def bench_local(repeat: int) -> list:
+    """Time checks through the in-process engine"""
+    engine = get_local_engine()
+    start = time.perf_counter()
+    engine.check_spelling(SAMPLE_SENTENCES[0])
+    print(f"local engine load: {(time.perf_counter() - start) * 1000:.0f} ms")
+    
+    latencies = []
+    for _ in range(repeat):
+        for sentence in SAMPLE_SENTENCES:
+            start = time.perf_counter()
+            engine.check_spelling(sentence)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def bench_http(base_url: str, repeat: int) -> list:
+    """Time checks through the backend HTTP API"""
+    latencies = []
+    with httpx.Client(base_url=base_url, timeout=30.0) as client:
+        for _ in range(repeat):
+            for sentence in SAMPLE_SENTENCES:
+                start = time.perf_counter()
+                response = client.post("/api/v1/check_spelling", json={"sentence": sentence})
+                response.raise_for_status()
+                response.json()
+                latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f"in-process: {_summarize(bench_local(args.repeat))}")
+    try:
+        print(f"http:       {_summarize(bench_http(args.base_url, args.repeat))}")
+    except httpx.ConnectError:
+        print(f"http:       skipped, no backend at {args.base_url}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Measure how long the result view blocks the event loop for large results.
+
+Usage: python benchmark_render.py [--corrections N]
+Runs offscreen unless QT_QPA_PLATFORM is already set.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+
+from ui import MainWindow
+from ui.result_view import ResultRenderer, highlight_segments
+
+
+WORDS = ["මම", "ගෙදර", "යනවා", "ඔයා", "කොහෙද", "අද", "හොඳ", "දවසක්", "ළමයි", "පාසලට"]
+
+
+def synthetic_result(corrections: int, seed: int = 0) -> dict:
+    """A spelling result with the given number of corrections at real offsets"""
+    rng = random.Random(seed)
+    pieces, found, position = [], [], 0
+    while len(found) < corrections:
+        word = rng.choice(WORDS)
+        if rng.random() < 0.3:
+            found.append({"word": word, "correction": rng.choice(WORDS), "distance": 1,
+                          "start": position, "end": position + len(word)})
+        # A paragraph break every 40 words, like a real document
+        separator = "\n" if len(pieces) % 40 == 39 else " "
+        pieces.append(word + separator)
+        position += len(word) + 1
+    original = "".join(pieces)
+    corrected = "".join(text for text, _ in highlight_segments(original, found, original))
+    return {"original_sentence": original, "corrected_sentence": corrected, "corrections": found}
+
+
+def time_render_steps(steps: list):
+    """Record the duration of every event loop turn the renderer occupies"""
+    render_step = ResultRenderer._render_step
+
+    def timed_step(self):
+        start = time.perf_counter()
+        render_step(self)
+        steps.append(time.perf_counter() - start)
+
+    ResultRenderer._render_step = timed_step
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark result rendering")
+    parser.add_argument("--corrections", type=int, nargs="+", default=[100, 1000, 5000])
+    args = parser.parse_args()
+
+    steps = []
+    time_render_steps(steps)
+
+    app = QApplication(sys.argv)
+    window = MainWindow()
+    window.show()
+    renderer = window.result_renderer
+
+    for count in args.corrections:
+        result = synthetic_result(count)
+        # Let the previous result finish painting, as it would between checks
+        for _ in range(10):
+            app.processEvents()
+        steps.clear()
+        
+        start = time.perf_counter()
+        window._on_api_success(result)
+        handler = time.perf_counter() - start
+        while renderer.is_rendering():
+            app.processEvents()
+        total = time.perf_counter() - start
+
+        print(f"{count:>6} corrections: handler {handler * 1000:6.2f} ms, "
+              f"longest step {max(steps) * 1000:6.2f} ms, {len(steps)} steps, "
+              f"complete after {total * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import sys
+import threading
+from typing import Optional
+
+
+# Backend checkout whose spelling engine is hosted in-process
+BACKEND_DIR = os.environ.get(
+    "SINHALA_BACKEND_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+)
+
+
+class LocalEngine:
+    """Runs the backend spelling engine inside the frontend process"""
+    
+    def __init__(self, backend_dir: str = BACKEND_DIR):
+        self.backend_dir = backend_dir
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._thread = None
+        self._check_sentence = None
+        self._dictionary = None
+        self._error = None
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the dictionary is ready to use"""
+        return self._loaded.is_set() and self._error is None
+    
+    def preload(self):
+        """Start loading the dictionary on a background thread, once"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._load, name="local-engine-loader", daemon=True
+                )
+                self._thread.start()
+    
+    def _load(self):
+        """Import the backend engine and load the dictionary"""
+        try:
+            if self.backend_dir not in sys.path:
+                sys.path.insert(0, self.backend_dir)
+            from app.services.spell_checker import check_sentence
+            from app.utils.utils import load_dictionary
+            
+            self._dictionary = load_dictionary(
+                os.path.join(self.backend_dir, "app", "utils", "sinhala_dict_with_ipa.csv")
+            )
+            self._check_sentence = check_sentence
+        except Exception as e:
+            self._error = e
+        finally:
+            self._loaded.set()
+    
+    def check_spelling(self, sentence: str, timeout: Optional[float] = None) -> dict:
+        """Check a sentence, returning the same shape as /api/v1/check_spelling"""
+        self.preload()
+        if not self._loaded.wait(timeout):
+            raise TimeoutError("Local spelling engine is still loading")
+        if self._error is not None:
+            raise RuntimeError(f"Local spelling engine unavailable: {self._error}")
+        return self._check_sentence(sentence, self._dictionary)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_local_engine() -> LocalEngine:
+    """Return the process-wide local engine"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = LocalEngine()
+        return _engine
@@ -2,6 +2,8 @@ import sys
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QFont
 from ui.main_window import MainWindow
+from api_client import ENGINE_MODE
+from local_engine import get_local_engine
 
 
 def main():
@@ -23,6 +25,10 @@ def main():
     window = MainWindow()
     window.show()
     
+    # The in-process engine is the primary one; warm it up once the window is visible
+    if ENGINE_MODE == "local":
+        get_local_engine().preload()
+    
     # Run application event loop
     sys.exit(app.exec())
 
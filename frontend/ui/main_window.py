@@ -1,11 +1,33 @@
+import re
+from itertools import chain
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QTextEdit, QPushButton, QFrame, QGroupBox,
-    QSizePolicy
+    QSizePolicy, QCheckBox
 )
-from PySide6.QtCore import Qt, Signal, QThreadPool
+from PySide6.QtCore import Qt, Signal, QThreadPool, QTimer
 from PySide6.QtGui import QFont, QColor, QPalette
 from api_client import APIWorker
+from .result_view import ResultRenderer, highlight_segments
+
+
+# Delay after the last keystroke before a live check is sent
+LIVE_CHECK_DELAY_MS = 400
+# Minimum interval between result view refreshes (~60 fps)
+RENDER_INTERVAL_MS = 16
+
+# A sentence runs up to a terminator (., ?, !, kunddaliya) or a line break
+SENTENCE_PATTERN = re.compile(r"[^.!?\u0df4\n]+[.!?\u0df4]*")
+
+
+def split_sentences(text: str) -> list:
+    """Split text into stripped, non-empty sentences in document order"""
+    sentences = []
+    for match in SENTENCE_PATTERN.finditer(text):
+        sentence = match.group().strip()
+        if sentence:
+            sentences.append(sentence)
+    return sentences
 
 
 class MainWindow(QMainWindow):
@@ -24,6 +46,31 @@ class MainWindow(QMainWindow):
         
         # Initialize thread pool for API calls
         self.thread_pool = QThreadPool()
+        
+        self._setup_live_check()
+    
+    def _setup_live_check(self):
+        """Prepare state and timers for as-you-type checking"""
+        # Results of the last check for each sentence, keyed by sentence text
+        self._sentence_results = {}
+        # Workers still in flight, keyed by the sentence they are checking
+        self._inflight_workers = {}
+        # Sentences of the document as of the most recent live check
+        self._live_sentences = []
+        
+        # Restarted on every edit so only a pause in typing triggers a check
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(LIVE_CHECK_DELAY_MS)
+        self.live_timer.timeout.connect(self._run_live_check)
+        
+        # Coalesces bursts of responses into a single repaint per frame
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(RENDER_INTERVAL_MS)
+        self.render_timer.timeout.connect(self._render_live_results)
+        
+        self.input_text.textChanged.connect(self._on_input_changed)
     
     def _setup_window(self):
         """Configure main window properties"""
@@ -105,6 +152,10 @@ class MainWindow(QMainWindow):
                 background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
                     stop:0 #f64956, stop:1 #d1222f);
             }
+            QCheckBox {
+                font-size: 13px;
+                spacing: 8px;
+            }
             QLabel#titleLabel {
                 color: #00d9ff;
                 font-size: 28px;
@@ -196,6 +247,12 @@ class MainWindow(QMainWindow):
         self.clear_button.clicked.connect(self._on_clear_clicked)
         button_layout.addWidget(self.clear_button)
         
+        # Live checking toggle
+        self.live_check_box = QCheckBox("Check as you type")
+        self.live_check_box.setCursor(Qt.PointingHandCursor)
+        self.live_check_box.toggled.connect(self._on_live_check_toggled)
+        button_layout.addWidget(self.live_check_box)
+        
         parent_layout.addWidget(button_frame)
     
     def _create_result_section(self, parent_layout):
@@ -211,6 +268,8 @@ class MainWindow(QMainWindow):
         
         result_layout.addWidget(self.result_text)
         parent_layout.addWidget(self.result_group)
+        
+        self.result_renderer = ResultRenderer(self.result_text)
     
     def _center_window(self):
         """Center the window on the screen"""
@@ -228,7 +287,7 @@ class MainWindow(QMainWindow):
     
     def set_result_text(self, text: str):
         """Set the result text area content"""
-        self.result_text.setPlainText(text)
+        self.result_renderer.render([(text, None)])
     
     def append_result_text(self, text: str):
         """Append text to the result area"""
@@ -237,7 +296,7 @@ class MainWindow(QMainWindow):
     def clear_all(self):
         """Clear both input and result text areas"""
         self.input_text.clear()
-        self.result_text.clear()
+        self.result_renderer.clear()
     
     def set_checking_state(self, is_checking: bool):
         """Update UI state during checking operation"""
@@ -248,34 +307,30 @@ class MainWindow(QMainWindow):
             self.check_button.setText("🔍 Check Spelling and Grammar")
     
     def show_success_result(self, corrected_sentence: str, has_errors: bool = False, 
-                           corrections: list = None):
+                           corrections: list = None, text_segments: list = None):
         """Display the checking results in a formatted way"""
-        self.result_text.clear()
-        
-        # Show corrected sentence
-        self.result_text.append(corrected_sentence)
-        self.result_text.append("")
-        self.result_text.append("━" * 50)
-        self.result_text.append("Grammar Check Results:")
-        self.result_text.append("")
+        # text_segments highlights corrected words inline; plain text without it
+        segments = [("\n\n" + "━" * 50 + "\nGrammar Check Results:\n\n", None)]
         
         if has_errors and corrections:
-            self.result_text.append("Status: ⚠️ Grammatical errors found")
-            self.result_text.append("")
-            self.result_text.append("Corrections needed:")
-            for error in corrections:
-                word = error.get('word', '')
-                correction = error.get('correction', '')
-                self.result_text.append(f"  • '{word}' → '{correction}'")
+            segments.append(("Status: ⚠️ Grammatical errors found\n\nCorrections needed:", None))
+            # Generated as the renderer reaches them, so long lists cost nothing up front
+            lines = (
+                (f"\n  • '{error.get('word', '')}' → '{error.get('correction', '')}'", None)
+                for error in corrections
+            )
         else:
-            self.result_text.append("Status: ✓ No grammatical errors found")
+            segments.append(("Status: ✓ No grammatical errors found", None))
+            lines = ()
+        
+        # Batched document updates, spread over frames for long results
+        self.result_renderer.render(
+            chain(text_segments or [(corrected_sentence, None)], segments, lines)
+        )
     
     def show_error(self, title: str, message: str):
         """Display an error message in the result area"""
-        self.result_text.clear()
-        self.result_text.append(f"❌ {title}")
-        self.result_text.append("")
-        self.result_text.append(message)
+        self.result_renderer.render([(f"❌ {title}\n\n{message}", None)])
     
     # --- Signal Handlers ---
     
@@ -302,8 +357,10 @@ class MainWindow(QMainWindow):
         corrected_sentence = result.get("corrected_sentence", "")
         corrections = result.get("corrections", [])
         has_errors = len(corrections) > 0
-        print(result, has_errors, corrections)
-        self.show_success_result(corrected_sentence, has_errors, corrections)
+        segments = highlight_segments(
+            result.get("original_sentence", corrected_sentence), corrections, corrected_sentence
+        )
+        self.show_success_result(corrected_sentence, has_errors, corrections, segments)
     
     def _on_api_error(self, error_message: str):
         """Handle API error"""
@@ -314,3 +371,118 @@ class MainWindow(QMainWindow):
         """Handle clear button click"""
         self.clear_all()
         self.clear_requested.emit()
+    
+    # --- Live Checking ---
+    
+    def is_live_check_enabled(self) -> bool:
+        """Whether as-you-type checking is switched on"""
+        return self.live_check_box.isChecked()
+    
+    def _on_live_check_toggled(self, enabled: bool):
+        """Start or stop as-you-type checking"""
+        if enabled:
+            self._run_live_check()
+        else:
+            # Nothing queued by live mode may overwrite a later manual check
+            self.live_timer.stop()
+            self.render_timer.stop()
+            self._cancel_stale_workers(set())
+            self._sentence_results = {}
+            self._live_sentences = []
+    
+    def _on_input_changed(self):
+        """Debounce edits while live checking is enabled"""
+        if self.is_live_check_enabled():
+            self.live_timer.start()
+    
+    def _run_live_check(self):
+        """Send only the sentences whose results are not known yet"""
+        self._live_sentences = split_sentences(self.input_text.toPlainText())
+        current = set(self._live_sentences)
+        
+        # Forget results and requests for sentences no longer in the document
+        self._sentence_results = {
+            sentence: result for sentence, result in self._sentence_results.items()
+            if sentence in current
+        }
+        self._cancel_stale_workers(current)
+        
+        for sentence in current:
+            if sentence in self._sentence_results or sentence in self._inflight_workers:
+                continue
+            
+            worker = APIWorker(sentence)
+            # Keep ownership so queued workers can be taken back safely
+            worker.setAutoDelete(False)
+            worker.signals.finished.connect(
+                lambda result, s=sentence, w=worker: self._on_live_result(s, w, result)
+            )
+            worker.signals.error.connect(
+                lambda message, s=sentence, w=worker: self._on_live_error(s, w, message)
+            )
+            self._inflight_workers[sentence] = worker
+            self.thread_pool.start(worker)
+        
+        self._schedule_render()
+    
+    def _cancel_stale_workers(self, current: set):
+        """Drop workers whose sentence is no longer part of the document"""
+        for sentence in list(self._inflight_workers):
+            if sentence not in current:
+                worker = self._inflight_workers.pop(sentence)
+                # Workers that already started finish, but their response is discarded
+                self.thread_pool.tryTake(worker)
+    
+    def _on_live_result(self, sentence: str, worker: APIWorker, result: dict):
+        """Merge a single sentence result into the displayed corrections"""
+        if self._inflight_workers.get(sentence) is not worker:
+            return  # Stale response for an edited or removed sentence
+        del self._inflight_workers[sentence]
+        self._sentence_results[sentence] = result
+        self._schedule_render()
+    
+    def _on_live_error(self, sentence: str, worker: APIWorker, error_message: str):
+        """Report a live check failure unless it is stale"""
+        if self._inflight_workers.get(sentence) is not worker:
+            return
+        del self._inflight_workers[sentence]
+        self.show_error("Connection Error", error_message)
+    
+    def _schedule_render(self):
+        """Repaint the result view at most once per frame"""
+        if not self.render_timer.isActive():
+            self.render_timer.start()
+    
+    def _render_live_results(self):
+        """Show the merged results for all sentences of the document"""
+        if not self.is_live_check_enabled():
+            return
+        
+        if not self._live_sentences:
+            self.result_renderer.clear()
+            return
+        
+        corrected_sentences = []
+        corrections = []
+        segments = []
+        for sentence in self._live_sentences:
+            if segments:
+                segments.append((" ", None))
+            result = self._sentence_results.get(sentence)
+            if result is None:
+                # Still being checked; show it unchanged for now
+                corrected_sentences.append(sentence)
+                segments.append((sentence, None))
+                continue
+            corrected = result.get("corrected_sentence", sentence)
+            sentence_corrections = result.get("corrections", [])
+            corrected_sentences.append(corrected)
+            corrections.extend(sentence_corrections)
+            # Offsets are relative to each sentence, so highlights are placed per sentence
+            segments.extend(highlight_segments(
+                result.get("original_sentence", sentence), sentence_corrections, corrected
+            ))
+        
+        self.show_success_result(
+            " ".join(corrected_sentences), len(corrections) > 0, corrections, segments
+        )
@@ -0,0 +1,118 @@
+"""
+Batched, progressive rendering of checking results into a QTextEdit
+"""
+
+import time
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtGui import QColor, QTextCharFormat, QTextCursor
+
+
+# Time spent inserting and laying out text per event loop turn; the rest of
+# the frame is left for painting and input
+RENDER_BUDGET_MS = 8
+# Paragraphs inserted in the first turn, before the cost per paragraph is known
+INITIAL_BLOCKS_PER_STEP = 4
+
+
+def highlight_segments(original: str, corrections: list, corrected: str) -> list:
+    """Split a checked sentence into (text, correction) pieces; correction is None for unchanged text"""
+    located = [c for c in corrections if c.get("start") is not None and c.get("end") is not None]
+    if len(located) != len(corrections):
+        # Offsets are needed to place highlights; show the text unmarked
+        return [(corrected, None)]
+
+    segments = []
+    position = 0
+    for correction in sorted(located, key=lambda c: c["start"]):
+        if correction["start"] > position:
+            segments.append((original[position:correction["start"]], None))
+        segments.append((correction.get("correction", ""), correction))
+        position = correction["end"]
+    if position < len(original):
+        segments.append((original[position:], None))
+    return segments
+
+
+class ResultRenderer(QObject):
+    """Writes results into a read-only QTextEdit in large edit blocks
+
+    Text is inserted through one QTextCursor inside beginEditBlock /
+    endEditBlock, so the document lays out once per batch instead of once per
+    line. Long results are spread over several event loop turns, each limited
+    to RENDER_BUDGET_MS, so the window keeps painting while they arrive.
+    Batches end at a paragraph break, since appending to a paragraph that is
+    already laid out lays out the whole paragraph again. Segments are pulled
+    from an iterable as they are rendered, so callers can pass generators.
+    """
+
+    def __init__(self, text_edit):
+        super().__init__(text_edit)
+        self.text_edit = text_edit
+        # The result view is read-only; undo history would only cost memory
+        self.text_edit.document().setUndoRedoEnabled(False)
+
+        self._segments = None
+        self._blocks_per_step = INITIAL_BLOCKS_PER_STEP
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._render_step)
+
+        self.plain_format = QTextCharFormat()
+        self.highlight_format = QTextCharFormat()
+        self.highlight_format.setBackground(QColor("#fdecea"))
+        self.highlight_format.setForeground(QColor("#b3261e"))
+        self.highlight_format.setFontUnderline(True)
+        self.highlight_format.setUnderlineColor(QColor("#b3261e"))
+
+    def render(self, segments):
+        """Replace the view with an iterable of (text, correction or None) segments"""
+        self.clear()
+        self._segments = iter(segments)
+        self._render_step()
+
+    def clear(self):
+        """Empty the view and drop anything still waiting to be inserted"""
+        self._timer.stop()
+        self._segments = None
+        self._blocks_per_step = INITIAL_BLOCKS_PER_STEP
+        self.text_edit.clear()
+
+    def is_rendering(self) -> bool:
+        """Whether part of the last result is still waiting to be inserted"""
+        return self._segments is not None
+
+    def _render_step(self):
+        """Insert the next batch of paragraphs as one document update"""
+        start = time.perf_counter()
+        cursor = QTextCursor(self.text_edit.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        blocks = 0
+        for text, correction in self._segments:
+            cursor.insertText(text, self._format_for(correction))
+            if "\n" in text:
+                blocks += 1
+                if blocks >= self._blocks_per_step:
+                    break
+        else:
+            self._segments = None
+        # Layout happens when the edit block ends, so it is timed as well
+        cursor.endEditBlock()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        # Size the next batch from this one's cost per paragraph
+        scale = min(2.0, RENDER_BUDGET_MS / max(elapsed_ms, 0.1))
+        self._blocks_per_step = max(1, int(self._blocks_per_step * scale))
+
+        if self.is_rendering():
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def _format_for(self, correction) -> QTextCharFormat:
+        """Highlight corrected words, with the original word as a tooltip"""
+        if correction is None:
+            return self.plain_format
+        text_format = QTextCharFormat(self.highlight_format)
+        text_format.setToolTip(f"{correction.get('word', '')} → {correction.get('correction', '')}")
+        return text_format
@@ -1,21 +1,51 @@
-from transformers import XLMRobertaTokenizer, XLMRobertaForSequenceClassification, XLMRobertaConfig
-import pandas as pd
-from datasets import Dataset
+from __future__ import annotations
+
+import hashlib
 import os
 import json
-import numpy as np
-import torch
-import evaluate
-from typing import Dict, List, Tuple
-from sklearn.metrics import precision_score, recall_score, f1_score, confusion_matrix
+import re
+import threading
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+# torch, transformers, datasets, evaluate and sklearn take seconds to import;
+# they are imported where they are used, so the checker and its cheap stages
+# load instantly and the model stack only when a sentence reaches it
+if TYPE_CHECKING:
+    import pandas as pd
+    from datasets import Dataset
+
+# Cascade stages, cheapest first
+STAGE_EXACT_MATCH = 'exact_match'
+STAGE_HEURISTIC = 'heuristic'
+STAGE_MODEL = 'model'
+
+HEURISTIC_CONFIDENCE = 0.9
+# Agreement tables, shared with the backend
+HEURISTICS_PATH = 'data/grammar_heuristics.json'
+
+
+def load_heuristics(file_path: str) -> Dict:
+    with open(file_path, encoding='utf-8') as f:
+        tables = json.load(f)
+    return {
+        'subject_verb_endings': tables['subject_verb_endings'],
+        'formal_verb': re.compile(tables['formal_verb_pattern']),
+        'coordinators': set(tables['coordinators']),
+    }
 
 class SinhalaGrammarChecker:
     def __init__(self):
         self.model_path = "models/model2"
+        self.heuristics = load_heuristics(HEURISTICS_PATH)
+        self.load_error = None
         self.tokenizer = None
         self.model = None
         self.max_length = 512
         self.model_name = 'xlm-roberta-base'
+        self.sentence_index = None
+        self._indexed_df = None
+        self._stats_lock = threading.Lock()
+        self.stats = {STAGE_EXACT_MATCH: 0, STAGE_HEURISTIC: 0, STAGE_MODEL: 0}
 
     def preprocess_text(self, text: str) -> str:
         return text.strip()
@@ -29,12 +59,17 @@ class SinhalaGrammarChecker:
         return list(zip(incorrect_words, correct_words))
 
     def create_dataset(self, texts: List[str], labels: List[int]) -> Dataset:
+        from datasets import Dataset
+
         return Dataset.from_dict({
             'text': [self.preprocess_text(str(text)) for text in texts],
             'label': labels
         })
 
     def prepare_training_data(self, file_path: str) -> Tuple[Dataset, Dataset]:
+        import numpy as np
+        import pandas as pd
+
         df = pd.read_csv(file_path)
 
         texts = []
@@ -67,6 +102,10 @@ class SinhalaGrammarChecker:
         return tokenized
 
     def compute_metrics(self, eval_pred: Tuple) -> Dict:
+        import evaluate
+        import numpy as np
+        from sklearn.metrics import precision_score, recall_score, f1_score
+
         predictions, labels = eval_pred
         predictions = np.argmax(predictions, axis=1)
 
@@ -81,6 +120,8 @@ class SinhalaGrammarChecker:
         return metrics
 
     def initialize_model_and_tokenizer(self):
+        from transformers import XLMRobertaTokenizer, XLMRobertaForSequenceClassification, XLMRobertaConfig
+
         # Initialize tokenizer
         self.tokenizer = XLMRobertaTokenizer.from_pretrained(
             self.model_name,
@@ -103,10 +144,21 @@ class SinhalaGrammarChecker:
         )
 
     def load_model(self, load_path: str = None) -> None:
-        load_path = load_path or self.model_path
+        # A failure is remembered so checks fall back instead of loading again
+        try:
+            self._load_model(load_path or self.model_path)
+        except Exception as e:
+            self.load_error = e
+            raise
+        self.load_error = None
+
+    def _load_model(self, load_path: str) -> None:
         if not os.path.exists(load_path):
             raise ValueError(f"Model path {load_path} does not exist")
 
+        import torch
+        from transformers import XLMRobertaTokenizer, XLMRobertaForSequenceClassification, XLMRobertaConfig
+
         # Load configuration
         with open(os.path.join(load_path, 'config.json'), 'r') as f:
             config_dict = json.load(f)
@@ -135,16 +187,104 @@ class SinhalaGrammarChecker:
         device = 'cuda' if torch.cuda.is_available() else 'cpu'
         self.model = self.model.to(device)
 
+    @staticmethod
+    def sentence_key(text: str) -> bytes:
+        return hashlib.blake2b(' '.join(text.split()).encode('utf-8'), digest_size=8).digest()
+
+    def build_sentence_index(self, df: pd.DataFrame) -> None:
+        """Hash every known sentence to (has_error, correction)."""
+        index = {}
+        for incorrect, correct in zip(df['incorrect_sentence'], df['correct_sentence']):
+            index.setdefault(self.sentence_key(str(incorrect)), (1, str(correct)))
+        # A sentence listed as correct anywhere is treated as correct
+        for correct in df['correct_sentence']:
+            index[self.sentence_key(str(correct))] = (0, None)
+        self.sentence_index = index
+        self._indexed_df = df
+
+    def check_known_sentence(self, text: str, df: pd.DataFrame):
+        if self._indexed_df is not df:
+            self.build_sentence_index(df)
+        return self.sentence_index.get(self.sentence_key(text))
+
+    def check_heuristics(self, words: List[str]):
+        """Correct definite subject-verb agreement violations; anything else is None."""
+        if len(words) < 2:
+            return None
+        expected = self.heuristics['subject_verb_endings'].get(words[0])
+        if expected is None or self.heuristics['coordinators'].intersection(words[1:-1]):
+            return None
+
+        verb = words[-1]
+        # Words that only happen to end like a verb (භූමි) do not match
+        match = self.heuristics['formal_verb'].search(verb)
+        if match is None or match.group('ending') == expected:
+            return None
+        corrected_verb = verb[:match.start('ending')] + expected
+        return 1, ' '.join(words[:-1] + [corrected_verb])
+
+    def build_result(self, text: str, has_error: int, confidence: float,
+                     correction: str, stage: str) -> Dict:
+        problematic_words = []
+        if has_error == 1 and correction:
+            word_alignments = self.align_words(text, correction)
+            for i, (incorrect, correct) in enumerate(word_alignments):
+                if incorrect != correct:
+                    problematic_words.append({
+                        'word': incorrect,
+                        'position': i,
+                        'correction': correct
+                    })
+
+        with self._stats_lock:
+            self.stats[stage] += 1
+            model_calls_avoided = self.stats[STAGE_EXACT_MATCH] + self.stats[STAGE_HEURISTIC]
+        return {
+            'text': text,
+            'has_error': bool(has_error),
+            'confidence': confidence,
+            'correction': correction,
+            'problematic_words': problematic_words,
+            'suggestion': correction if correction else ('Grammatical error detected' if has_error else 'No grammatical errors detected.'),
+            'stage': stage,
+            'model_calls_avoided': model_calls_avoided
+        }
+
     def check_grammar(self, text: str, df: pd.DataFrame) -> Dict:
+        text = self.preprocess_text(text)
+        words = self.tokenize_sentence(text)
+
+        # Cheap stages first; the transformer only sees undecided sentences
+        known = self.check_known_sentence(text, df)
+        if known is not None:
+            has_error, correction = known
+            return self.build_result(text, has_error, 1.0, correction, STAGE_EXACT_MATCH)
+
+        decided = self.check_heuristics(words)
+        if decided is not None:
+            has_error, correction = decided
+            return self.build_result(text, has_error, HEURISTIC_CONFIDENCE, correction, STAGE_HEURISTIC)
+
         if not self.model or not self.tokenizer:
-            self.load_model()
+            if self.load_error is None:
+                try:
+                    self.load_model()
+                except Exception:
+                    pass  # Kept in load_error
+            if self.load_error is not None:
+                return {
+                    'text': text,
+                    'has_error': None,
+                    'confidence': None,
+                    'error': f"Grammar model unavailable: {self.load_error}",
+                    'stage': STAGE_MODEL
+                }
+
+        import torch
 
         device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         self.model = self.model.to(device)
 
-        text = self.preprocess_text(text)
-        words = self.tokenize_sentence(text)
-
         try:
             inputs = self.tokenizer(
                 text,
@@ -162,29 +302,8 @@ class SinhalaGrammarChecker:
                 has_error = torch.argmax(predictions).item()
                 confidence = predictions[0][has_error].item()
 
-            correction = None
-            problematic_words = []
-
-            if has_error == 1:
-                correction = self.get_correction(text, df)
-                if correction:
-                    word_alignments = self.align_words(text, correction)
-                    for i, (incorrect, correct) in enumerate(word_alignments):
-                        if incorrect != correct:
-                            problematic_words.append({
-                                'word': incorrect,
-                                'position': i,
-                                'correction': correct
-                            })
-
-            return {
-                'text': text,
-                'has_error': bool(has_error),
-                'confidence': confidence,
-                'correction': correction,
-                'problematic_words': problematic_words,
-                'suggestion': correction if correction else ('Grammatical error detected' if has_error else 'No grammatical errors detected.')
-            }
+            correction = self.get_correction(text, df) if has_error == 1 else None
+            return self.build_result(text, has_error, confidence, correction, STAGE_MODEL)
 
         except Exception as e:
             print(f"Error during grammar checking: {str(e)}")
@@ -192,7 +311,8 @@ class SinhalaGrammarChecker:
                 'text': text,
                 'has_error': None,
                 'confidence': None,
-                'error': str(e)
+                'error': str(e),
+                'stage': STAGE_MODEL
             }
 
     def get_correction(self, text: str, df: pd.DataFrame) -> str:
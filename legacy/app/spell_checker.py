@@ -12,7 +12,9 @@ def spell_check(word, ipa_list, top_n=3):
     return word_distances[:top_n]
 
 
-def check_sentence(sentence, sinhala_dictionary):
+def check_sentence(sentence, sinhala_dictionary, on_word=None):
+    # on_word(done, total) is called after each word; the UI uses it for
+    # progress and raises from it to cancel a check
     ipa_list = sinhala_dictionary["IPA"]  # List of IPA representations
     ipa_to_word = sinhala_dictionary["word"]  # Map IPA to actual words
 
@@ -20,7 +22,7 @@ def check_sentence(sentence, sinhala_dictionary):
     corrected_words = []  # Store corrected words
     suggestions = {}  # Store suggestions for each word
 
-    for word in words:
+    for i, word in enumerate(words):
         # Get top suggestions based on IPA
         top_words = spell_check(sinhala_to_ipa(word), ipa_list, top_n=3)
         if top_words:
@@ -36,6 +38,9 @@ def check_sentence(sentence, sinhala_dictionary):
             corrected_words.append(word)  # Use original word if no suggestion
             suggestions[word] = [("No suggestion", None)]  # No suggestions available
 
+        if on_word is not None:
+            on_word(i + 1, len(words))
+
     # Combine corrected words into a sentence
     corrected_sentence = " ".join(corrected_words)
 
@@ -1,14 +1,114 @@
+import queue
+import threading
 import tkinter as tk
 from tkinter import messagebox, ttk
 from app.spell_checker import check_sentence
 from app.utils import load_dictionary
 from app.grammar_checker import SinhalaGrammarChecker
-import pandas as pd
 
-# Load the Sinhala dictionary CSV
-sinhala_dictionary = load_dictionary("data/sinhala_dict_with_ipa.csv")
+DICTIONARY_PATH = "data/sinhala_dict_with_ipa.csv"
+SENTENCES_PATH = "data/merged_sentences.csv"
+MODEL_PATH = "models/model2"
+POLL_INTERVAL_MS = 50  # How often the UI drains messages from worker threads
+
+
+class CheckCancelled(Exception):
+    pass
+
+
+class Resources:
+    """Dictionary, known sentences and grammar model, loaded on a background thread."""
+
+    def __init__(self):
+        self.dictionary = None
+        self.sentences = None
+        self.grammar_checker = SinhalaGrammarChecker()
+        self.grammar_lock = threading.Lock()  # One model call at a time
+        self.dictionary_error = None
+        self.grammar_error = None
+        self.dictionary_ready = threading.Event()
+        self.grammar_ready = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._load, daemon=True).start()
+
+    def _load(self):
+        # Dictionary first: spelling results can be shown before the model is ready
+        try:
+            self.dictionary = load_dictionary(DICTIONARY_PATH)
+        except Exception as e:
+            self.dictionary_error = e
+        finally:
+            self.dictionary_ready.set()
+
+        try:
+            import pandas as pd
+
+            self.sentences = pd.read_csv(SENTENCES_PATH)
+            self.grammar_checker.build_sentence_index(self.sentences)
+            self.grammar_checker.load_model(MODEL_PATH)
+        except Exception as e:
+            self.grammar_error = e
+        finally:
+            self.grammar_ready.set()
+
 
 def launch_ui():
+    resources = Resources()
+    messages = queue.Queue()  # (job id, kind, payload) from worker threads
+    current_job = {'id': 0, 'cancel': None}
+
+    def wait_for(event, cancel):
+        while not event.wait(0.1):
+            if cancel.is_set():
+                raise CheckCancelled()
+
+    def run_check(job_id, input_text, cancel):
+        # Runs on a worker thread; it never touches Tk, only the message queue
+        def post(kind, payload=None):
+            messages.put((job_id, kind, payload))
+
+        def on_word(done, total):
+            if cancel.is_set():
+                raise CheckCancelled()
+            post('progress', (done, total + 1))  # The grammar check is the last step
+
+        try:
+            if not resources.dictionary_ready.is_set():
+                post('status', "Loading dictionary...")
+            wait_for(resources.dictionary_ready, cancel)
+            if resources.dictionary_error:
+                raise resources.dictionary_error
+
+            post('status', "Checking spelling...")
+            original_sentence, corrected_sentence = check_sentence(
+                input_text, resources.dictionary, on_word
+            )
+            post('spelling', corrected_sentence)
+        except CheckCancelled:
+            post('cancelled')
+            return
+        except Exception as e:
+            post('error', f"Error during spell checking: {str(e)}")
+            return
+
+        try:
+            if not resources.grammar_ready.is_set():
+                post('status', "Waiting for the grammar model to load...")
+            wait_for(resources.grammar_ready, cancel)
+            if resources.sentences is None:
+                raise resources.grammar_error
+
+            post('status', "Checking grammar...")
+            with resources.grammar_lock:
+                result = resources.grammar_checker.check_grammar(corrected_sentence, resources.sentences)
+            if cancel.is_set():
+                raise CheckCancelled()
+            post('grammar', (corrected_sentence, result))
+        except CheckCancelled:
+            post('cancelled')
+        except Exception as e:
+            post('error', f"Error during grammar checking: {str(e)}")
 
     def check_spelling():
         input_text = input_box.get("1.0", tk.END).strip()
@@ -16,32 +116,81 @@ def launch_ui():
             messagebox.showwarning("Input Error", "Please enter some text!")
             return
 
+        # A new check replaces any running one
+        cancel_check()
+        current_job['id'] += 1
+        current_job['cancel'] = threading.Event()
+        threading.Thread(
+            target=run_check,
+            args=(current_job['id'], input_text, current_job['cancel']),
+            daemon=True
+        ).start()
+
+        progress_bar.configure(value=0, maximum=1)
+        cancel_button.configure(state=tk.NORMAL)
+
+    def cancel_check():
+        if current_job['cancel'] is not None:
+            current_job['cancel'].set()
+            current_job['cancel'] = None
+        cancel_button.configure(state=tk.DISABLED)
+
+    def finish_check(status):
+        current_job['cancel'] = None
+        cancel_button.configure(state=tk.DISABLED)
+        status_var.set(status)
+
+    def poll_messages():
+        # Apply worker results on the Tk thread; stale jobs are ignored
         try:
-            # Perform spell checking
-            original_sentence, corrected_sentence = check_sentence(input_text, sinhala_dictionary)
-    
-            # Perform grammar check on corrected sentence
-            check_grammar(corrected_sentence)
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Error during spell checking: {str(e)}")
+            while True:
+                job_id, kind, payload = messages.get_nowait()
+                if job_id != current_job['id']:
+                    continue
+                if kind == 'status':
+                    status_var.set(payload)
+                elif kind == 'progress':
+                    done, total = payload
+                    progress_bar.configure(value=done, maximum=total)
+                elif kind == 'spelling':
+                    show_spelling(payload)
+                elif kind == 'grammar':
+                    progress_bar.configure(value=progress_bar['maximum'])
+                    show_grammar(*payload)
+                    finish_check("Done")
+                elif kind == 'cancelled':
+                    finish_check("Check cancelled")
+                elif kind == 'error':
+                    finish_check("Check failed")
+                    messagebox.showerror("Error", payload)
+        except queue.Empty:
+            pass
+
+        if not resources.grammar_ready.is_set():
+            preload_var.set("Loading grammar model in the background...")
+        elif resources.grammar_error:
+            preload_var.set(f"Grammar model unavailable: {resources.grammar_error}")
+        else:
+            preload_var.set("Grammar model ready")
+        root.after(POLL_INTERVAL_MS, poll_messages)
 
-    def check_grammar(sentence):
+    def show_spelling(sentence):
+        # Spelling corrections are shown while the grammar check runs
+        result_box.delete("1.0", tk.END)
+        result_box.insert(tk.END, sentence)
+
+    def show_grammar(sentence, result):
         try:
-            # Initialize grammar checker
-            grammar_checker = SinhalaGrammarChecker()
-            grammar_checker.load_model("models/model2")
-            
-            # Get DataFrame for corrections
-            df = pd.read_csv("data/merged_sentences.csv")
-            
-            # Check grammar
-            result = grammar_checker.check_grammar(sentence, df)
-            
             # Display results
             result_box.delete("1.0", tk.END)
             
-            if result['has_error']:
+            if 'error' in result:
+                # The model could not run, so nothing is known about the grammar
+                result_box.insert(tk.END, sentence)
+                result_box.insert(tk.END, "\n\nGrammar Check Results:\n")
+                result_box.insert(tk.END, "\nStatus: Grammar checking is unavailable\n")
+                result_box.insert(tk.END, f"{result['error']}\n")
+            elif result['has_error']:
                 result_box.insert(tk.END, result['correction'] if result['correction'] else sentence)
                 
                 result_box.insert(tk.END, "\n\nGrammar Check Results:\n")
@@ -60,8 +209,11 @@ def launch_ui():
             messagebox.showerror("Error", f"Error during grammar checking: {str(e)}")
 
     def clear_all():
+        cancel_check()
         input_box.delete("1.0", tk.END)
         result_box.delete("1.0", tk.END)
+        progress_bar.configure(value=0)
+        status_var.set("")
 
     # Create the main window
     root = tk.Tk()
@@ -126,6 +278,30 @@ def launch_ui():
     )
     clear_button.pack(side=tk.LEFT, padx=5)
 
+    cancel_button = ttk.Button(
+        button_frame,
+        text="Cancel",
+        command=cancel_check,
+        style='Check.TButton',
+        state=tk.DISABLED
+    )
+    cancel_button.pack(side=tk.LEFT, padx=5)
+
+    # Progress section
+    progress_frame = ttk.Frame(main_frame)
+    progress_frame.pack(fill=tk.X, pady=(0, 10))
+
+    progress_bar = ttk.Progressbar(progress_frame, mode='determinate')
+    progress_bar.pack(fill=tk.X, padx=5)
+
+    status_var = tk.StringVar()
+    status_label = ttk.Label(progress_frame, textvariable=status_var)
+    status_label.pack(side=tk.LEFT, padx=5)
+
+    preload_var = tk.StringVar()
+    preload_label = ttk.Label(progress_frame, textvariable=preload_var, foreground='#666666')
+    preload_label.pack(side=tk.RIGHT, padx=5)
+
     # Result section
     result_frame = ttk.LabelFrame(main_frame, text="Corrected Sentence", padding="5")
     result_frame.pack(fill=tk.BOTH, expand=True)
@@ -149,5 +325,9 @@ def launch_ui():
     y = (root.winfo_screenheight() // 2) - (height // 2)
     root.geometry(f'+{x}+{y}')
 
+    # Load resources once the window is on screen
+    root.after_idle(resources.start)
+    root.after(POLL_INTERVAL_MS, poll_messages)
+
     # Run the application
     root.mainloop()